@@ -0,0 +1,128 @@
+import 'dart:convert';
+import 'dart:typed_data';
+
+/// Compact binary payloads for the pending operations queue.
+///
+/// [SyncOperationDocument.operationData] is a String column, so binary
+/// payloads are stored base64-encoded behind [prefix], which a JSON payload
+/// can never start with. Operations queued as JSON keep working unchanged.
+class CompactPayload {
+  static const String prefix = 'b64:';
+
+  /// Whether operationData holds a binary payload rather than JSON
+  static bool isBinary(String? operationData) =>
+      operationData != null && operationData.startsWith(prefix);
+
+  static String encode(List<int> bytes) => '$prefix${base64Encode(bytes)}';
+
+  static Uint8List decode(String operationData) =>
+      base64Decode(operationData.substring(prefix.length));
+}
+
+/// Writes the primitives of a compact DTO layout.
+///
+/// Integers are zigzag varints, doubles are little-endian float64, strings
+/// are length-prefixed UTF-8 and DateTimes are UTC microseconds. Nullable
+/// values are preceded by a presence flag written by [writePresence].
+class CompactWriter {
+  final BytesBuilder _bytes = BytesBuilder(copy: false);
+
+  void writeUint16(int value) {
+    _bytes
+      ..addByte(value & 0xff)
+      ..addByte((value >> 8) & 0xff);
+  }
+
+  void writeBool(bool value) => _bytes.addByte(value ? 1 : 0);
+
+  void writeInt(int value) => _writeVarint((value << 1) ^ (value >> 63));
+
+  void writeDouble(double value) {
+    final data = ByteData(8)..setFloat64(0, value, Endian.little);
+    _bytes.add(data.buffer.asUint8List());
+  }
+
+  void writeString(String value) {
+    final encoded = utf8.encode(value);
+    _writeVarint(encoded.length);
+    _bytes.add(encoded);
+  }
+
+  void writeDateTime(DateTime value) =>
+      writeInt(value.toUtc().microsecondsSinceEpoch);
+
+  /// Writes whether value is present; the caller writes the value only if true
+  bool writePresence(Object? value) {
+    writeBool(value != null);
+    return value != null;
+  }
+
+  Uint8List takeBytes() => _bytes.takeBytes();
+
+  void _writeVarint(int value) {
+    var remaining = value;
+    while (remaining & ~0x7f != 0) {
+      _bytes.addByte((remaining & 0x7f) | 0x80);
+      remaining = remaining >>> 7;
+    }
+    _bytes.addByte(remaining);
+  }
+}
+
+/// Reads values written by [CompactWriter], in the same order.
+class CompactReader {
+  final Uint8List _bytes;
+  int _offset = 0;
+
+  CompactReader(List<int> bytes)
+    : _bytes = bytes is Uint8List ? bytes : Uint8List.fromList(bytes);
+
+  int readUint16() {
+    final value = _bytes[_offset] | (_bytes[_offset + 1] << 8);
+    _offset += 2;
+    return value;
+  }
+
+  bool readBool() => _bytes[_offset++] != 0;
+
+  int readInt() {
+    final value = _readVarint();
+    return (value >>> 1) ^ -(value & 1);
+  }
+
+  double readDouble() {
+    final value = ByteData.sublistView(
+      _bytes,
+      _offset,
+      _offset + 8,
+    ).getFloat64(0, Endian.little);
+    _offset += 8;
+    return value;
+  }
+
+  String readString() {
+    final length = _readVarint();
+    final value = utf8.decode(
+      Uint8List.sublistView(_bytes, _offset, _offset + length),
+    );
+    _offset += length;
+    return value;
+  }
+
+  DateTime readDateTime() =>
+      DateTime.fromMicrosecondsSinceEpoch(readInt(), isUtc: true);
+
+  /// Reads the flag written by [CompactWriter.writePresence]
+  bool readPresence() => readBool();
+
+  int _readVarint() {
+    var value = 0;
+    var shift = 0;
+    while (true) {
+      final byte = _bytes[_offset++];
+      value |= (byte & 0x7f) << shift;
+      if (byte & 0x80 == 0) return value;
+      shift += 7;
+    }
+  }
+}
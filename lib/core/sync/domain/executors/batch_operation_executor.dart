@@ -0,0 +1,22 @@
+import 'package:trackflow/core/sync/data/models/sync_operation_document.dart';
+import 'package:trackflow/core/sync/domain/executors/operation_executor.dart';
+
+/// An [OperationExecutor] that can also push a run of queued operations
+/// for its entity type in one remote write.
+///
+/// PendingOperationsManager groups consecutive operations of the same
+/// entity type (up to [maxBatchSize]) and hands them to [executeBatch]
+/// instead of paying one network round trip per operation.
+abstract class BatchOperationExecutor implements OperationExecutor {
+  /// Maximum number of writes in a single Firestore WriteBatch
+  static const int firestoreBatchLimit = 500;
+
+  /// Largest run of operations passed to [executeBatch]
+  int get maxBatchSize;
+
+  /// Execute all operations atomically: either every write lands or none do.
+  ///
+  /// Throws an exception if the batch fails; the caller then retries the
+  /// operations one by one so each keeps its own retry count.
+  Future<void> executeBatch(List<SyncOperationDocument> operations);
+}
@@ -1,8 +1,10 @@
 import 'dart:convert';
 import 'package:injectable/injectable.dart';
+import 'package:trackflow/core/sync/data/models/compact_payload.dart';
 import 'package:trackflow/core/sync/data/models/sync_operation_document.dart';
 import 'package:trackflow/core/sync/data/repositories/pending_operations_repository.dart';
 import 'package:trackflow/core/network/network_state_manager.dart';
+import 'package:trackflow/core/sync/domain/executors/batch_operation_executor.dart';
 import 'package:trackflow/core/sync/domain/executors/operation_executor_factory.dart';
 import 'package:dartz/dartz.dart';
 import 'package:trackflow/core/error/failures.dart';
@@ -36,19 +38,26 @@ class PendingOperationsManager {
 
   /// Core method to add any operation to the queue
   /// Repositories use the specific helpers below this method
+  /// A binary [payload] (a DTO's toBytes()) takes precedence over JSON [data]
   Future<Either<Failure, Unit>> addOperation({
     required String entityType,
     required String entityId,
     required String operationType,
     required SyncPriority priority,
     Map<String, dynamic>? data,
+    List<int>? payload,
   }) async {
     final operation = SyncOperationDocument.create(
       entityType: entityType,
       entityId: entityId,
       operationType: operationType,
       priority: priority,
-      operationData: data != null ? jsonEncode(data) : null,
+      operationData:
+          payload != null
+              ? CompactPayload.encode(payload)
+              : data != null
+              ? jsonEncode(data)
+              : null,
     );
 
     final result = await _repositoryPendingOperations.addOperation(operation);
@@ -64,15 +73,18 @@ class PendingOperationsManager {
   Future<Either<Failure, Unit>> addCreateOperation({
     required String entityType,
     required String entityId,
-    required Map<String, dynamic> data,
+    Map<String, dynamic>? data,
+    List<int>? payload,
     SyncPriority priority = SyncPriority.medium,
   }) async {
+    assert(data != null || payload != null);
     return await addOperation(
       entityType: entityType,
       entityId: entityId,
       operationType: 'create',
       priority: priority,
       data: data,
+      payload: payload,
     );
   }
 
@@ -81,15 +93,18 @@ class PendingOperationsManager {
   Future<Either<Failure, Unit>> addUpdateOperation({
     required String entityType,
     required String entityId,
-    required Map<String, dynamic> data,
+    Map<String, dynamic>? data,
+    List<int>? payload,
     SyncPriority priority = SyncPriority.medium,
   }) async {
+    assert(data != null || payload != null);
     return await addOperation(
       entityType: entityType,
       entityId: entityId,
       operationType: 'update',
       priority: priority,
       data: data,
+      payload: payload,
     );
   }
 
@@ -205,9 +220,71 @@ class PendingOperationsManager {
 
     for (final priority in priorities) {
       final priorityOperations = operationsByPriority[priority] ?? [];
-      for (final operation in priorityOperations) {
+      for (final run in _batchRuns(priorityOperations)) {
+        if (run.length > 1) {
+          await _processBatch(run);
+        } else {
+          await _processOperation(run.single);
+        }
+      }
+    }
+  }
+
+  /// 📦 Splits operations into runs that can share one batch write:
+  /// consecutive, retryable operations of an entity type whose executor
+  /// supports batching. Everything else becomes a run of one.
+  List<List<SyncOperationDocument>> _batchRuns(
+    List<SyncOperationDocument> operations,
+  ) {
+    final runs = <List<SyncOperationDocument>>[];
+    for (final operation in operations) {
+      final executor = _batchExecutorFor(operation.entityType);
+      final current = runs.isEmpty ? null : runs.last;
+      if (executor != null &&
+          operation.canRetry() &&
+          current != null &&
+          current.first.entityType == operation.entityType &&
+          current.first.canRetry() &&
+          current.length < executor.maxBatchSize) {
+        current.add(operation);
+      } else {
+        runs.add([operation]);
+      }
+    }
+    return runs;
+  }
+
+  BatchOperationExecutor? _batchExecutorFor(String entityType) {
+    try {
+      final executor = _executorFactory.getExecutor(entityType);
+      return executor is BatchOperationExecutor ? executor : null;
+    } on UnsupportedError {
+      return null;
+    }
+  }
+
+  /// 📦 Executes a run of operations in one batch write
+  /// A failed batch is retried one by one so retry counts stay per operation
+  Future<void> _processBatch(List<SyncOperationDocument> operations) async {
+    final executor =
+        _executorFactory.getExecutor(operations.first.entityType)
+            as BatchOperationExecutor;
+
+    try {
+      await executor.executeBatch(operations);
+    } catch (e) {
+      AppLogger.warning(
+        'Batch of ${operations.length} ${executor.entityType} operations failed, retrying individually: $e',
+        tag: 'PendingOperationsManager',
+      );
+      for (final operation in operations) {
         await _processOperation(operation);
       }
+      return;
+    }
+
+    for (final operation in operations) {
+      await _repositoryPendingOperations.markOperationCompleted(operation.id);
     }
   }
 
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+TrackFlow Feature Generator Benchmarks
+Times rendering and writing of synthetic features so template and generator
+changes can be compared against a stored baseline.
+
+Usage:
+    python benchmark_generator.py [options]
+
+Example:
+    python benchmark_generator.py --save-baseline
+    python benchmark_generator.py --counts 1 10 --repeats 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_feature import (  # noqa: E402
+    APP_MODULE_PATH,
+    EXECUTOR_FACTORY_PATH,
+    FeatureGenerator,
+    GenerationLock,
+    MemoryBackend,
+    OutputBackend,
+    StagedBackend,
+    TemplateRegistry,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+DEFAULT_COUNTS = (1, 10, 100)
+BACKENDS = ("memory", "disk")
+# Cycled over the synthetic features so every template path is exercised
+SPEC_VARIANTS = (
+    {},
+    {"paginated": True},
+    {"binary_payloads": True, "fields": ["title:String", "count:int", "dueDate:DateTime?:indexed"]},
+    {"offload_threshold": 2000, "queries": ["title,isDeleted"], "fields": ["title:String", "done:bool"]},
+    {"thin": True},
+)
+# Differences below these floors are noise, whatever the relative change
+NOISE_FLOORS = {"_ms": 5.0, "_peak_kib": 256.0, "_syscalls": 50.0, "_fs_calls": 50.0}
+METRIC_UNITS = {"_ms": "ms", "_peak_kib": "KiB", "_syscalls": "calls", "_fs_calls": "calls"}
+# Audit events (PEP 578) counted as filesystem calls; os.replace reports os.rename.
+# stat() has no audit event, so exists() checks are not included.
+FS_AUDIT_EVENTS = {"open": "open", "os.mkdir": "mkdir", "os.rename": "rename",
+                   "os.remove": "remove", "os.rmdir": "rmdir"}
+
+_fs_calls: Counter = Counter()
+_fs_hook_installed = False
+
+
+def feature_name(number: int) -> str:
+    """bench_a, bench_b, ..., bench_ba: feature names may not contain digits."""
+    letters = ""
+    number += 1
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = string.ascii_lowercase[remainder] + letters
+    return f"bench_{letters}"
+
+
+def synthetic_specs(count: int) -> List[Dict]:
+    return [
+        {"name": feature_name(number), "with_tests": True, **SPEC_VARIANTS[number % len(SPEC_VARIANTS)]}
+        for number in range(count)
+    ]
+
+
+def make_project(parent: Path) -> Path:
+    """A throwaway project root holding the hand-maintained files the generator patches."""
+    root = Path(tempfile.mkdtemp(prefix="trackflow_bench_", dir=parent))
+    (root / "pubspec.yaml").write_text("name: trackflow\n", encoding='utf-8')
+    for rel in (APP_MODULE_PATH, EXECUTOR_FACTORY_PATH):
+        if (REPO_ROOT / rel).exists():
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(REPO_ROOT / rel, root / rel)
+    return root
+
+
+def read_syscalls() -> Optional[Dict[str, int]]:
+    """read()/write() syscall counters of this process; Linux only."""
+    try:
+        text = Path("/proc/self/io").read_text()
+    except OSError:
+        return None
+    fields = dict(line.split(": ") for line in text.splitlines())
+    return {"read": int(fields["syscr"]), "write": int(fields["syscw"])}
+
+
+def _count_fs_call(event: str, args: tuple):
+    kind = FS_AUDIT_EVENTS.get(event)
+    if kind:
+        _fs_calls[kind] += 1
+
+
+def count_fs_calls() -> int:
+    """open/mkdir/rename/remove/rmdir calls made by this process so far.
+
+    These are what the staged backend saves; /proc/self/io only counts
+    read() and write(). Audit hooks cannot be removed, so it is installed once.
+    """
+    global _fs_hook_installed
+    if not _fs_hook_installed:
+        sys.addaudithook(_count_fs_call)
+        _fs_hook_installed = True
+    return sum(_fs_calls.values())
+
+
+def measure(phase: Callable[[], None], traced: bool) -> Dict[str, float]:
+    """Wall time, syscalls and filesystem calls of one call to phase; peak Python allocations when traced."""
+    syscalls_before = read_syscalls()
+    fs_calls_before = count_fs_calls()
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        phase()
+    elapsed = time.perf_counter() - start
+    result = {"ms": elapsed * 1000}
+    if traced:
+        result["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    result["fs_calls"] = count_fs_calls() - fs_calls_before
+    syscalls_after = read_syscalls()
+    if syscalls_before and syscalls_after:
+        result["read_syscalls"] = syscalls_after["read"] - syscalls_before["read"]
+        result["write_syscalls"] = syscalls_after["write"] - syscalls_before["write"]
+    return result
+
+
+def run_once(specs: List[Dict], backend_name: str, templates: TemplateRegistry, workdir: Path,
+             traced: bool) -> Dict[str, float]:
+    """Render every spec, then write them all the way a manifest run does."""
+    project_root = make_project(workdir)
+    backend: OutputBackend = (
+        MemoryBackend(read_through=True) if backend_name == "memory" else StagedBackend(project_root)
+    )
+    lock = GenerationLock(project_root)
+    rendered = []
+
+    def render():
+        for spec in specs:
+            generator = FeatureGenerator.from_spec(
+                spec, project_root, lock=lock, backend=backend, templates=templates
+            )
+            rendered.append((generator, generator.render_all_files(
+                spec.get("skip_presentation", False), spec.get("with_tests", False)
+            )))
+
+    def write():
+        for generator, files in rendered:
+            generator.write_files(files)
+            generator.register_operation_executor()
+            generator.register_isar_schema()
+        backend.commit()
+        if backend_name == "disk":
+            lock.save()
+
+    try:
+        phases = {"render": measure(render, traced), "write": measure(write, traced)}
+    finally:
+        shutil.rmtree(project_root, ignore_errors=True)
+
+    metrics = {
+        "files": sum(len(files) for _, files in rendered),
+        "bytes": sum(len(generated.content.encode('utf-8')) for _, files in rendered for generated in files),
+    }
+    for phase, values in phases.items():
+        for key, value in values.items():
+            metrics[f"{phase}_{key}"] = value
+    return metrics
+
+
+def run_scenario(count: int, backend_name: str, repeats: int, templates: TemplateRegistry,
+                 workdir: Path) -> Dict[str, float]:
+    """Best-of-repeats timings and syscalls, plus peak memory from one extra traced run.
+
+    Tracing slows allocation-heavy code down a lot, so it never overlaps a timed run.
+    """
+    specs = synthetic_specs(count)
+    runs = [run_once(specs, backend_name, templates, workdir, traced=False) for _ in range(repeats)]
+    metrics = {key: min(run[key] for run in runs) for key in runs[0]}
+    traced = run_once(specs, backend_name, templates, workdir, traced=True)
+    metrics.update({key: value for key, value in traced.items() if key.endswith("_peak_kib")})
+    return {key: round(value, 2) if isinstance(value, float) else value for key, value in metrics.items()}
+
+
+def noise_floor(metric: str) -> Optional[float]:
+    for suffix, floor in NOISE_FLOORS.items():
+        if metric.endswith(suffix):
+            return floor
+    return None
+
+
+def find_regressions(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Metrics that grew by more than tolerance (and their noise floor) over the baseline."""
+    regressions = []
+    for scenario, metrics in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario, {})
+        for metric, value in metrics.items():
+            floor = noise_floor(metric)
+            old = previous.get(metric)
+            if floor is None or old is None:
+                continue
+            if value > old * (1 + tolerance) and value - old > floor:
+                unit = next(unit for suffix, unit in METRIC_UNITS.items() if metric.endswith(suffix))
+                regressions.append(f"{scenario} {metric}: {old:,.1f} → {value:,.1f} {unit} "
+                                   f"({(value / old - 1) * 100 if old else float('inf'):+.0f}%)")
+    return regressions
+
+
+def print_table(results: Dict):
+    print(f"  {'scenario':<12} {'files':>6} {'render ms':>10} {'write ms':>9} "
+          f"{'render KiB':>11} {'write KiB':>10} {'fs calls':>9} {'read/write syscalls':>20}")
+    print(f"  {'':<12} {'':>6} {'':>10} {'':>9} {'':>11} {'':>10} {'(write phase)':>30}")
+    for scenario, metrics in results["scenarios"].items():
+        syscalls = (f"{metrics['write_read_syscalls']}/{metrics['write_write_syscalls']}"
+                    if "write_read_syscalls" in metrics else "n/a")
+        print(f"  {scenario:<12} {metrics['files']:>6} {metrics['render_ms']:>10.1f} {metrics['write_ms']:>9.1f} "
+              f"{metrics['render_peak_kib']:>11,.0f} {metrics['write_peak_kib']:>10,.0f} "
+              f"{metrics['write_fs_calls']:>9} {syscalls:>20}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark TrackFlow feature generation against a stored baseline",
+    )
+    parser.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_COUNTS),
+        help=f"Numbers of synthetic features per scenario (default: {' '.join(map(str, DEFAULT_COUNTS))})"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        action="append",
+        help="Limit the run to one output backend (repeatable; default: both)"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Timed runs per scenario; the fastest is reported (default: 3)"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help=f"Baseline results to compare against (default: {DEFAULT_BASELINE.name})"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this run as the new baseline instead of comparing against it"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative growth over the baseline flagged as a regression (default: 0.25)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Also write this run's results as JSON to this path"
+    )
+    parser.add_argument(
+        "--templates-dir",
+        type=Path,
+        help="Directory of *.dart.tmpl templates overriding the built-in ones"
+    )
+    args = parser.parse_args()
+
+    if args.repeats < 1 or any(count < 1 for count in args.counts):
+        print("❌ Error: --counts and --repeats must be at least 1")
+        return 1
+
+    templates = TemplateRegistry.load(args.templates_dir)
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "template_version": templates.version,
+        "scenarios": {},
+    }
+    print(f"⏱️  Benchmarking feature generation ({args.repeats} timed runs per scenario)...")
+    with tempfile.TemporaryDirectory(prefix="trackflow_bench_") as workdir:
+        for backend_name in args.backend or BACKENDS:
+            for count in args.counts:
+                scenario = f"{backend_name}/{count}"
+                results["scenarios"][scenario] = run_scenario(count, backend_name, args.repeats, templates, Path(workdir))
+                print(f"  {scenario} done")
+
+    print("\n📊 Results")
+    print_table(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding='utf-8')
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding='utf-8')
+        print(f"\n💾 Saved baseline to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"\nℹ️  No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    if baseline.get("python") != results["python"] or baseline.get("platform") != results["platform"]:
+        print(f"\n⚠️  Baseline was recorded on Python {baseline.get('python')} ({baseline.get('platform')}); "
+              "comparisons across machines are unreliable")
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) over {args.tolerance:.0%} against the baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print(f"\n✅ No regressions over {args.tolerance:.0%} against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
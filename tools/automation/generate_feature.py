@@ -5,28 +5,1011 @@ A comprehensive script to generate Clean Architecture + DDD boilerplate code for
 
 Usage:
     python generate_feature.py <feature_name> [options]
+    python generate_feature.py --manifest features.yaml [options]
 
 Example:
     python generate_feature.py notifications --with-tests
     python generate_feature.py user_settings --skip-presentation
+    python generate_feature.py --manifest features.yaml --jobs 4
 """
 
 import os
 import sys
+import json
+import hashlib
+import shutil
+import tempfile
+import time
 import argparse
+import contextlib
+import cProfile
+import difflib
+import io
+import queue
+import shlex
+import socketserver
+import subprocess
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 import re
 
+try:
+    import yaml
+except ImportError:  # PyYAML is optional; JSON manifests work without it
+    yaml = None
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional; --watch polls without it
+    Observer = None
+
+FEATURE_NAME_PATTERN = re.compile(r'^[a-z_]+$')
+
+# Bump whenever template output changes so lock files show which version produced a file
+TEMPLATE_VERSION = "1"
+LOCK_FILE_NAME = ".trackflow_gen.lock"
+INDEX_FILE_NAME = ".trackflow_index.json"
+PROFILE_FILE_NAME = "trackflow_profile.json"
+# Bump whenever symbol extraction changes so cached indexes are rebuilt
+INDEX_VERSION = 1
+
+BUILTIN_TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+TEMPLATE_SUFFIX = ".dart.tmpl"
+# A placeholder alone on its line is a block: it drops the whole line when empty
+TEMPLATE_TOKEN_PATTERN = re.compile(
+    r'(?P<blockline>^[ \t]*\{\{\s*(?P<block>[a-z_][a-z0-9_]*)\s*\}\}[ \t]*\n)'
+    r'|\{\{\s*(?P<inline>[a-z_][a-z0-9_]*)\s*\}\}',
+    re.MULTILINE,
+)
+
+LAYER_HEADERS = {
+    "domain": "📋 Generating Domain Layer...",
+    "data": "💾 Generating Data Layer...",
+    "presentation": "🎨 Generating Presentation Layer...",
+    "tests": "🧪 Generating Test Files...",
+}
+
+
+class GeneratedFile(NamedTuple):
+    """A rendered file waiting to be written."""
+    layer: str
+    path: Path
+    content: str
+
+
+# The query behind every generated watch{Feature}sByUser
+WATCH_BY_USER_QUERY = ("createdBy", "isDeleted")
+# --paginated reads pages newest-first, so createdAt trails the watch query in one index
+PAGE_BY_USER_QUERY = WATCH_BY_USER_QUERY + ("createdAt",)
+
+FIELD_TYPES = ("String", "int", "double", "bool", "DateTime")
+# How a DateTime is stored in the Isar document: native DateTime, epoch millis or ISO-8601 string
+DATETIME_STORAGE = ("datetime", "epoch", "iso")
+FIELD_NAME_PATTERN = re.compile(r'^[a-z][A-Za-z0-9]*$')
+# Fields every generated feature owns; they cannot be redeclared in a field spec
+RESERVED_FIELDS = ("id", "createdBy", "version", "lastModified", "isDeleted", "deletedAt", "isarId")
+# Audit timestamps; a field spec may redeclare them only to change storage or indexing
+TIMESTAMP_FIELDS = ("createdAt", "updatedAt")
+DEFAULT_FIELDS = ("name:String", "description:String")
+# Seconds a background sync key stays fresh before another read re-triggers it
+DEFAULT_SYNC_TTL = 30
+# Budgets asserted by --with-perf-tests; the generated tests also read PERF_<NAME> dart-defines
+PERF_BUDGETS = {"watch_1k_ms": 50, "watch_10k_ms": 500, "bloc_emissions_per_sec": 200}
+# CompactWriter/CompactReader method suffix per field type, used by --binary-payloads
+COMPACT_CODECS = {"String": "String", "int": "Int", "double": "Double", "bool": "Bool", "DateTime": "DateTime"}
+
+
+class FieldSpec(NamedTuple):
+    """One domain field, emitted in lock-step across the entity, DTO and Isar document."""
+    name: str
+    type: str
+    nullable: bool = False
+    indexed: bool = False
+    storage: Optional[str] = None
+
+    @classmethod
+    def parse(cls, entry) -> "FieldSpec":
+        """Accept "dueDate:DateTime?:indexed:epoch" or {name, type, nullable, indexed, storage}."""
+        if isinstance(entry, str):
+            name, _, rest = entry.partition(":")
+            type_name, *flags = rest.split(":") if rest else ["String"]
+            entry = {
+                "name": name,
+                "type": type_name,
+                "indexed": "indexed" in flags,
+                "storage": next((flag for flag in flags if flag in DATETIME_STORAGE), None),
+            }
+        type_name = str(entry.get("type", "String"))
+        spec = cls(
+            name=str(entry.get("name", "")),
+            type=type_name.rstrip("?"),
+            nullable=bool(entry.get("nullable", False)) or type_name.endswith("?"),
+            indexed=bool(entry.get("indexed", False)),
+            storage=entry.get("storage"),
+        )
+
+        if not FIELD_NAME_PATTERN.match(spec.name):
+            raise ValueError(f"Invalid field name {spec.name!r} (expected camelCase)")
+        if spec.name in RESERVED_FIELDS:
+            raise ValueError(f"Field '{spec.name}' is generated automatically and cannot be redeclared")
+        if spec.type not in FIELD_TYPES:
+            raise ValueError(f"Unsupported type '{spec.type}' for field '{spec.name}'; expected one of {', '.join(FIELD_TYPES)}")
+        if spec.type == "DateTime":
+            if spec.storage not in (None, *DATETIME_STORAGE):
+                raise ValueError(f"Unknown storage '{spec.storage}' for '{spec.name}'; expected one of {', '.join(DATETIME_STORAGE)}")
+            return spec._replace(storage=spec.storage or "datetime")
+        if spec.storage:
+            raise ValueError(f"Storage options only apply to DateTime fields, not '{spec.name}'")
+        return spec
+
+    @property
+    def dart_type(self) -> str:
+        return f"{self.type}?" if self.nullable else self.type
+
+    @property
+    def document_type(self) -> str:
+        stored = {"epoch": "int", "iso": "String"}.get(self.storage, self.type)
+        return f"{stored}?" if self.nullable else stored
+
+    @property
+    def optional(self) -> str:
+        return "?" if self.nullable else ""
+
+    def constructor_param(self) -> str:
+        return f"this.{self.name}," if self.nullable else f"required this.{self.name},"
+
+    def factory_param(self) -> str:
+        return f"{self.dart_type} {self.name}," if self.nullable else f"required {self.type} {self.name},"
+
+    def to_json(self) -> str:
+        if self.type == "DateTime":
+            return f"{self.name}{self.optional}.toIso8601String()"
+        return self.name
+
+    def from_json(self) -> str:
+        raw = f"json['{self.name}']"
+        if self.type == "DateTime":
+            if self.nullable:
+                return f"{raw} != null ? DateTime.parse({raw} as String) : null"
+            return f"DateTime.parse({raw} as String)"
+        if self.type == "double":
+            return f"({raw} as num{self.optional}){self.optional}.toDouble()"
+        return f"{raw} as {self.dart_type}"
+
+    def to_document(self, value: str) -> str:
+        if self.storage == "epoch":
+            return f"{value}{self.optional}.millisecondsSinceEpoch"
+        if self.storage == "iso":
+            return f"{value}{self.optional}.toIso8601String()"
+        return value
+
+    def from_document(self) -> str:
+        if self.storage == "epoch":
+            convert = "DateTime.fromMillisecondsSinceEpoch"
+        elif self.storage == "iso":
+            convert = "DateTime.parse"
+        else:
+            return self.name
+        if self.nullable:
+            return f"{self.name} != null ? {convert}({self.name}!) : null"
+        return f"{convert}({self.name})"
+
+    def to_bytes(self) -> str:
+        write = f"writer.write{COMPACT_CODECS[self.type]}"
+        if self.nullable:
+            return f"if (writer.writePresence({self.name})) {{\n      {write}({self.name}!);\n    }}"
+        return f"{write}({self.name});"
+
+    def from_bytes(self) -> str:
+        read = f"reader.read{COMPACT_CODECS[self.type]}()"
+        if self.nullable:
+            return f"reader.readPresence() ? {read} : null"
+        return read
+
+    def sample(self, variant: int) -> str:
+        """A Dart literal for tests; variants 0-3 give distinct values."""
+        if self.type == "String":
+            label = re.sub(r'([A-Z])', r' \1', self.name).title()
+            return f"'{('Test', 'New', 'Updated', 'Different')[variant]} {label}'"
+        if self.type == "int":
+            return str(variant + 1)
+        if self.type == "double":
+            return f"{variant + 1}.5"
+        if self.type == "bool":
+            return "true" if variant < 2 else "false"
+        return f"DateTime(2024, {variant + 1}, 1)"
+
+
+class QueryShape(NamedTuple):
+    """An equality query against a feature's Isar collection."""
+    name: Optional[str]
+    fields: Tuple[str, ...]
+
+    @classmethod
+    def parse(cls, entry) -> "QueryShape":
+        """Accept "createdBy,isDeleted", a list of fields, or {name, fields}."""
+        name = None
+        if isinstance(entry, dict):
+            name, entry = entry.get("name"), entry.get("fields", [])
+        if isinstance(entry, str):
+            entry = entry.split(",")
+        return cls(name, tuple(field.strip() for field in entry if field.strip()))
+
+
+class IndexPlanner:
+    """Chooses the Isar indexes that serve a set of equality query shapes.
+
+    A shape is served by any index whose properties start with the shape's
+    fields, so one composite (createdBy, isDeleted) index also answers
+    createdBy-only lookups. ``isDeleted`` is always queried as ``false``.
+    """
+
+    def __init__(self, shapes: Iterable[QueryShape], field_types: Dict[str, str]):
+        self.field_types = field_types
+        for shape in shapes:
+            if not shape.fields:
+                raise ValueError("Query shapes need at least one field")
+            unknown = [field for field in shape.fields if field not in field_types]
+            if unknown:
+                raise ValueError(f"Unknown query field(s) {', '.join(unknown)}; expected one of {', '.join(field_types)}")
+            if shape.fields[0] == "id":
+                raise ValueError("Queries by id are already served by the unique id index")
+
+        self.indexes: List[Tuple[str, ...]] = []
+        for fields in sorted({shape.fields for shape in shapes}, key=lambda fields: (-len(fields), fields)):
+            if not any(index[:len(fields)] == fields for index in self.indexes):
+                self.indexes.append(fields)
+
+    def annotations(self, field: str) -> List[str]:
+        """@Index annotations to put on field."""
+        annotations = []
+        for index in self.indexes:
+            if index[0] != field:
+                continue
+            if len(index) == 1:
+                annotations.append("@Index()")
+            else:
+                composite = ", ".join(f"CompositeIndex('{member}')" for member in index[1:])
+                annotations.append(f"@Index(composite: [{composite}])")
+        return annotations
+
+    def where_clause(self, fields: Tuple[str, ...], bindings: Optional[Dict[str, str]] = None) -> str:
+        """The index-backed where() method call for an equality query on fields.
+
+        Each field is matched against the Dart variable of the same name unless
+        bindings maps it to another expression.
+        """
+        bindings = {"isDeleted": "false", **(bindings or {})}
+        index = next(index for index in self.indexes if index[:len(fields)] == fields)
+        method = fields[0] + "".join(self._capitalize(field) for field in fields[1:])
+        arguments = ", ".join(bindings.get(field, field) for field in fields)
+        if len(fields) == len(index):
+            return f"{method}EqualTo({arguments})"
+        remaining = "".join(self._capitalize(field) for field in index[len(fields):])
+        return f"{method}EqualToAny{remaining}({arguments})"
+
+    def parameters(self, fields: Tuple[str, ...]) -> str:
+        return ", ".join(f"{self.field_types[field]} {field}" for field in fields if field != "isDeleted")
+
+    @staticmethod
+    def _capitalize(field: str) -> str:
+        return field[0].upper() + field[1:]
+
+
+class NamingContext(NamedTuple):
+    """Every spelling of a feature name the templates need, computed once per feature."""
+    snake: str
+    pascal: str
+    camel: str
+    snake_plural: str
+    pascal_plural: str
+    camel_plural: str
+
+
+def _render_block(value: str) -> str:
+    return value if not value or value.endswith("\n") else value + "\n"
+
+
+# (directory under lib/core/sync/data, template under core/) of the bases --thin features extend
+OFFLINE_FIRST_BASES = (
+    ("models", "offline_first_dto"),
+    ("datasources", "isar_local_datasource"),
+    ("datasources", "firestore_remote_datasource"),
+    ("repositories", "offline_first_repository"),
+)
+
+# Hand-maintained registry that maps entity types to their sync executors
+EXECUTOR_FACTORY_PATH = Path("lib/core/sync/domain/executors/operation_executor_factory.dart")
+
+
+def register_operation_executor(source: str, naming: NamingContext) -> str:
+    """Add a feature's executor to operation_executor_factory.dart source.
+
+    Inserts the import, a getExecutor() case and a supportedEntityTypes entry.
+    Returns source unchanged if the executor is already registered; raises
+    ValueError if the file no longer has the expected shape.
+    """
+    executor = f"{naming.pascal}OperationExecutor"
+    if f"sl<{executor}>()" in source:
+        return source
+
+    imports = list(re.finditer(r"^import .*;\n", source, re.MULTILINE))
+    default_case = re.search(r"^([ \t]*)default:", source, re.MULTILINE)
+    types_start = source.find("supportedEntityTypes => [")
+    types_end = source.find("];", types_start)
+    if not imports or not default_case or types_start < 0 or types_end < 0:
+        raise ValueError(f"Unexpected layout in {EXECUTOR_FACTORY_PATH.name}")
+
+    indent = default_case.group(1)
+    types_end = source.rfind("\n", 0, types_end) + 1
+    entry_indent = re.match(r"[ \t]*", source[source.rfind("\n", 0, types_end - 1) + 1:]).group(0)
+    edits = [
+        (imports[-1].end(),
+         f"import 'package:trackflow/core/sync/domain/executors/{naming.snake}_operation_executor.dart';\n"),
+        (default_case.start(), f"{indent}case '{naming.snake}':\n{indent}  return sl<{executor}>();\n"),
+        (types_end, f"{entry_indent}'{naming.snake}',\n"),
+    ]
+    for position, text in sorted(edits, reverse=True):
+        source = source[:position] + text + source[position:]
+    return source
+
+
+# Hand-maintained DI module; Isar.open only knows the schemas listed in it
+APP_MODULE_PATH = Path("lib/core/di/app_module.dart")
+# injectable aggregates every annotated class into this one file
+INJECTION_CONFIG_PATH = Path("lib/core/di/injection.config.dart")
+BUILD_RUNNER_COMMAND = ("flutter", "packages", "pub", "run", "build_runner", "build", "--delete-conflicting-outputs")
+
+
+def register_isar_schema(source: str, naming: NamingContext) -> str:
+    """Add a feature's DocumentSchema to the Isar.open schema list in app_module.dart source.
+
+    Inserts the document import and a list entry. Returns source unchanged if
+    the schema is already listed; raises ValueError if the file no longer has
+    the expected shape.
+    """
+    schema = f"{naming.pascal}DocumentSchema"
+    schemas_start = re.search(r"final schemas = \[\n", source)
+    schemas_end = source.find("];", schemas_start.end()) if schemas_start else -1
+    imports = list(re.finditer(r"^import .*;\n", source, re.MULTILINE))
+    if not schemas_start or schemas_end < 0 or not imports:
+        raise ValueError(f"Unexpected layout in {APP_MODULE_PATH.name}")
+    if re.search(rf"\b{schema}\b", source[schemas_start.end():schemas_end]):
+        return source
+
+    entry_indent = re.match(r"[ \t]*", source[schemas_start.end():]).group(0)
+    edits = [(source.rfind("\n", 0, schemas_end) + 1, f"{entry_indent}{schema},\n")]
+    document_import = f"import 'package:trackflow/features/{naming.snake}/data/models/{naming.snake}_document.dart';\n"
+    if document_import not in source:
+        edits.append((imports[-1].end(), document_import))
+    for position, text in sorted(edits, reverse=True):
+        source = source[:position] + text + source[position:]
+    return source
+
+
+def build_runner_command(build_filters: Iterable[str]) -> List[str]:
+    """A build_runner invocation that only builds the given outputs."""
+    return [*BUILD_RUNNER_COMMAND, *(f"--build-filter={output}" for output in build_filters)]
+
+
+def run_build_runner(project_root: Path, build_filters: List[str]) -> int:
+    """Run the scoped build_runner in project_root; returns its exit code."""
+    if not build_filters:
+        print("\n🔨 Nothing written that build_runner needs to rebuild")
+        return 0
+    command = build_runner_command(build_filters)
+    print(f"\n🔨 Running: {shlex.join(command)}")
+    try:
+        return subprocess.run(command, cwd=project_root).returncode
+    except FileNotFoundError:
+        print(f"⚠️  {command[0]} not found on PATH; run the command above manually")
+        return 1
+
+
+class TemplateRegistry:
+    """Loads the *.dart.tmpl templates once and compiles each into a render function.
+
+    Templates use ``{{ name }}`` placeholders filled from a flat context of
+    strings. Templates found in an override directory shadow the built-in ones
+    with the same relative name, so teams can customise output without
+    editing this script.
+    """
+
+    _loaded: Dict[Optional[Path], "TemplateRegistry"] = {}
+
+    def __init__(self, override_dirs: Iterable[Path] = ()):
+        self.sources: Dict[str, str] = {}
+        for directory in [BUILTIN_TEMPLATES_DIR, *override_dirs]:
+            for path in sorted(directory.rglob(f"*{TEMPLATE_SUFFIX}")):
+                name = path.relative_to(directory).as_posix()[:-len(TEMPLATE_SUFFIX)]
+                self.sources[name] = path.read_text(encoding='utf-8')
+
+        self._renderers = {name: self._compile(name, source) for name, source in self.sources.items()}
+
+        digest = hashlib.sha256()
+        for name in sorted(self.sources):
+            digest.update(name.encode('utf-8'))
+            digest.update(self.sources[name].encode('utf-8'))
+        self.version = f"{TEMPLATE_VERSION}+{digest.hexdigest()[:12]}"
+
+    @classmethod
+    def load(cls, override_dir: Optional[Path] = None) -> "TemplateRegistry":
+        """Return the registry for override_dir, reading templates from disk only the first time."""
+        key = override_dir.resolve() if override_dir else None
+        if key not in cls._loaded:
+            if key and not key.is_dir():
+                raise ValueError(f"Templates directory not found: {key}")
+            cls._loaded[key] = cls([key] if key else [])
+        return cls._loaded[key]
+
+    @classmethod
+    def reload(cls, override_dir: Optional[Path] = None) -> "TemplateRegistry":
+        """Re-read the templates for override_dir from disk (after an edit)."""
+        cls._loaded.pop(override_dir.resolve() if override_dir else None, None)
+        return cls.load(override_dir)
+
+    @staticmethod
+    def _compile(name: str, source: str) -> Callable[[Dict[str, str]], str]:
+        """Turn a template into a single ''.join(...) expression over its literals and context lookups."""
+        parts = []
+        position = 0
+        for match in TEMPLATE_TOKEN_PATTERN.finditer(source):
+            if match.start() > position:
+                parts.append(repr(source[position:match.start()]))
+            if match.group("block"):
+                parts.append(f"_block(ctx[{match.group('block')!r}])")
+            else:
+                parts.append(f"ctx[{match.group('inline')!r}]")
+            position = match.end()
+        if position < len(source):
+            parts.append(repr(source[position:]))
+
+        code = compile(f"lambda ctx: ''.join(({', '.join(parts)},))", f"<template {name}>", "eval")
+        return eval(code, {"_block": _render_block})
+
+    def render(self, name: str, context: Dict[str, str]) -> str:
+        if name not in self._renderers:
+            raise ValueError(f"Unknown template '{name}'")
+        try:
+            return self._renderers[name](context)
+        except KeyError as e:
+            raise ValueError(f"Template '{name}' uses undefined placeholder {e}") from None
+
+
+class GenerationLock:
+    """Content-hash manifest of generated files, stored in .trackflow_gen.lock at the project root."""
+
+    def __init__(self, project_root: Path):
+        self.path = project_root / LOCK_FILE_NAME
+        self.project_root = project_root
+        self.files: Dict[str, Dict[str, str]] = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            self.files = data.get("files", {})
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _key(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.project_root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def record(self, path: Path, content: str, feature: str, template_version: str = TEMPLATE_VERSION):
+        """Remember the hash of content as the generated version of path."""
+        self.files[self._key(path)] = {
+            "feature": feature,
+            "sha256": self.hash_content(content),
+            "template_version": template_version,
+        }
+
+    def is_modified(self, path: Path, disk_content: str) -> bool:
+        """True if the file on disk is not the one we last generated (or was never generated by us)."""
+        entry = self.files.get(self._key(path))
+        return entry is None or entry["sha256"] != self.hash_content(disk_content)
+
+    def save(self):
+        data = {"template_version": TEMPLATE_VERSION, "files": dict(sorted(self.files.items()))}
+        self.path.write_text(json.dumps(data, indent=2) + "\n", encoding='utf-8')
+
+
+# Outputs of build_runner and friends; they only repeat symbols from their sources
+GENERATED_DART_SUFFIXES = (".g.dart", ".config.dart", ".freezed.dart", ".mocks.dart")
+DART_TYPE_PATTERN = re.compile(
+    r'^[ \t]*(?:(?:abstract|base|final|sealed|interface)\s+)*(?:class|mixin|enum)\s+([A-Z]\w*)', re.MULTILINE
+)
+# Annotations that may sit between a registration/collection annotation and its class
+_ANNOTATIONS = r'(?:@\w+(?:\([^)]*\))?\s+)*'
+ISAR_COLLECTION_PATTERN = re.compile(r'@[Cc]ollection\b(?:\([^)]*\))?\s+' + _ANNOTATIONS + r'(?:abstract\s+)?class\s+(\w+)')
+FIRESTORE_COLLECTION_PATTERN = re.compile(r"(?:\bcollection\s*=\s*|\.collection\(\s*)'([^'$]+)'")
+DI_AS_PATTERN = re.compile(r'@(?:LazySingleton|Singleton|Injectable)\(\s*as:\s*(\w+)')
+DI_SELF_PATTERN = re.compile(
+    r'@(?:lazySingleton|singleton|injectable|LazySingleton\(\)|Singleton\(\)|Injectable\(\))\s+'
+    + _ANNOTATIONS + r'(?:abstract\s+)?class\s+(\w+)'
+)
+SYMBOL_KINDS = {
+    "types": "Type",
+    "isar_collections": "Isar collection accessor",
+    "firestore_collections": "Firestore collection",
+    "registrations": "DI registration of",
+}
+
+
+def extract_dart_symbols(source: str) -> Dict[str, List[str]]:
+    """Top-level names a Dart file claims project-wide, by kind (see SYMBOL_KINDS)."""
+    return {
+        "types": sorted(set(DART_TYPE_PATTERN.findall(source))),
+        # isar.{name}s is how the collection is reached, so that is what must be unique
+        "isar_collections": sorted({name[0].lower() + name[1:] + "s" for name in ISAR_COLLECTION_PATTERN.findall(source)}),
+        "firestore_collections": sorted(set(FIRESTORE_COLLECTION_PATTERN.findall(source))),
+        "registrations": sorted(set(DI_AS_PATTERN.findall(source)) | set(DI_SELF_PATTERN.findall(source))),
+    }
+
+
+class ProjectIndex:
+    """Symbols declared across lib/, cached in .trackflow_index.json at the project root.
+
+    Each file's entry is keyed by its mtime and size, so a refresh only stats
+    the tree and re-reads files that changed since the last run.
+    """
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self.path = project_root / INDEX_FILE_NAME
+        self.files: Dict[str, Dict] = {}
+        self.stats = Counter()
+        self._owners: Optional[Dict[str, Dict[str, List[str]]]] = None
+
+    @classmethod
+    def load(cls, project_root: Path, persist: bool = True) -> "ProjectIndex":
+        """Refresh the index; persist=False leaves the cache file untouched (dry runs)."""
+        index = cls(project_root)
+        index.refresh(persist)
+        return index
+
+    def _read_cache(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except ValueError:
+            return {}
+        return data.get("files", {}) if data.get("version") == INDEX_VERSION else {}
+
+    def _dart_files(self) -> Iterable[Path]:
+        for directory, subdirectories, filenames in os.walk(self.project_root / "lib"):
+            subdirectories[:] = [name for name in subdirectories if not name.startswith(".")]
+            for filename in filenames:
+                if filename.endswith(".dart") and not filename.endswith(GENERATED_DART_SUFFIXES):
+                    yield Path(directory) / filename
+
+    def refresh(self, persist: bool = True):
+        """Bring the index up to date with lib/, re-reading only files whose mtime or size changed."""
+        # A long-lived index (the --serve daemon) refreshes against its own entries
+        cached = self.files or self._read_cache()
+        files = {}
+        for path in self._dart_files():
+            key = path.relative_to(self.project_root).as_posix()
+            stat = path.stat()
+            entry = cached.get(key)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                self.stats["cached"] += 1
+            else:
+                entry = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "symbols": extract_dart_symbols(path.read_text(encoding='utf-8', errors='replace')),
+                }
+                self.stats["parsed"] += 1
+            files[key] = entry
+        self.stats["removed"] = len(cached.keys() - files.keys())
+        self.files = files
+        self._owners = None
+        if persist and (self.stats["parsed"] or self.stats["removed"]):
+            self.save()
+
+    def save(self):
+        data = {"version": INDEX_VERSION, "files": dict(sorted(self.files.items()))}
+        self.path.write_text(json.dumps(data, separators=(",", ":")) + "\n", encoding='utf-8')
+
+    def owners(self, kind: str, symbol: str) -> List[str]:
+        """Files under lib/ that declare symbol."""
+        if self._owners is None:
+            self._owners = {kind: {} for kind in SYMBOL_KINDS}
+            for key, entry in self.files.items():
+                for symbol_kind, symbols in entry["symbols"].items():
+                    for name in symbols:
+                        self._owners[symbol_kind].setdefault(name, []).append(key)
+        return self._owners[kind].get(symbol, [])
+
+    def collisions(self, files: Iterable[GeneratedFile]) -> List[str]:
+        """Describe every symbol the rendered lib/ files would declare that another file already owns.
+
+        Files being (re)generated do not count as owners, so regenerating a
+        feature never collides with itself; two planned files declaring the
+        same symbol do.
+        """
+        planned: Dict[str, Dict[str, List[str]]] = {}
+        for generated in files:
+            key = generated.path.relative_to(self.project_root).as_posix()
+            if key.startswith("lib/") and key not in planned:
+                planned[key] = extract_dart_symbols(generated.content)
+
+        declared_by: Dict[Tuple[str, str], List[str]] = {}
+        for key, symbols in planned.items():
+            for kind, names in symbols.items():
+                for name in names:
+                    declared_by.setdefault((kind, name), []).append(key)
+
+        messages = []
+        for (kind, name), keys in sorted(declared_by.items()):
+            existing = [owner for owner in self.owners(kind, name) if owner not in planned]
+            if existing:
+                messages.append(f"{SYMBOL_KINDS[kind]} '{name}' ({', '.join(keys)}) "
+                                f"is already declared in {', '.join(existing)}")
+            elif len(keys) > 1:
+                messages.append(f"{SYMBOL_KINDS[kind]} '{name}' would be declared by {', '.join(keys)}")
+        return messages
+
+    def check(self, files: Iterable[GeneratedFile]):
+        """Raise ValueError listing collisions before anything is written."""
+        messages = self.collisions(files)
+        if messages:
+            details = "".join(f"\n  - {message}" for message in messages)
+            raise ValueError(f"{len(messages)} name collision(s) with existing code (use --no-index to skip):{details}")
+
+    def report(self, elapsed: float) -> str:
+        return (f"🔎 Indexed {len(self.files)} Dart files in {elapsed * 1000:.0f} ms "
+                f"({self.stats['cached']} cached, {self.stats['parsed']} parsed)")
+
+
+class OutputBackend:
+    """Where rendered files go. Subclasses decide how and when they reach the disk."""
+
+    def exists(self, path: Path) -> bool:
+        raise NotImplementedError
+
+    def read(self, path: Path) -> str:
+        raise NotImplementedError
+
+    def write(self, path: Path, content: str):
+        raise NotImplementedError
+
+    def commit(self):
+        """Make every write visible. Called once after a whole feature (or batch) is rendered."""
+
+
+class MemoryBackend(OutputBackend):
+    """In-memory virtual filesystem for previews and tests; never touches the disk.
+
+    With read_through=True, files not written in memory are looked up on disk,
+    so skip/regenerate decisions match a real run.
+    """
+
+    def __init__(self, read_through: bool = False):
+        self.files: Dict[Path, str] = {}
+        self.read_through = read_through
+
+    def exists(self, path: Path) -> bool:
+        return path in self.files or (self.read_through and path.exists())
+
+    def read(self, path: Path) -> str:
+        if path in self.files:
+            return self.files[path]
+        return path.read_text(encoding='utf-8')
+
+    def write(self, path: Path, content: str):
+        self.files[path] = content
+
+
+class StagedBackend(MemoryBackend):
+    """Buffers writes and commits them through a temp tree under the project root.
+
+    Each directory is created once in the staging tree. Directories that do not
+    exist yet (e.g. a new lib/features/<name>) are moved into place with a single
+    rename, so a crash never leaves a half-written feature behind; files in
+    existing directories are replaced one by one with atomic renames.
+    """
+
+    def __init__(self, project_root: Path):
+        super().__init__(read_through=True)
+        self.project_root = project_root
+
+    def commit(self):
+        if not self.files:
+            return
+        staged = {path.relative_to(self.project_root): content for path, content in self.files.items()}
+        staging_root = Path(tempfile.mkdtemp(prefix=".trackflow_gen_staging_", dir=self.project_root))
+        try:
+            for directory in {staging_root / rel.parent for rel in staged}:
+                directory.mkdir(parents=True, exist_ok=True)
+            for rel, content in staged.items():
+                with open(staging_root / rel, 'w', encoding='utf-8') as f:
+                    f.write(content)
+
+            # Plan against the current tree before moving anything
+            moves = {}
+            for rel in staged:
+                new_root = self._topmost_missing_dir(rel)
+                moves[new_root or rel] = None
+            for rel in moves:
+                os.replace(staging_root / rel, self.project_root / rel)
+        finally:
+            shutil.rmtree(staging_root, ignore_errors=True)
+        self.files.clear()
+
+    def _topmost_missing_dir(self, rel: Path) -> Optional[Path]:
+        """Highest ancestor directory of rel that does not exist on disk yet, if any."""
+        missing = None
+        for parent in rel.parents:
+            if parent == Path("."):
+                break
+            if (self.project_root / parent).exists():
+                break
+            missing = parent
+        return missing
+
+
+class FileChange(NamedTuple):
+    """How one in-memory file differs from the disk."""
+    path: str  # Relative to the project root, POSIX separators
+    status: str  # "created" or "updated"
+    added: int
+    removed: int
+    byte_delta: int
+    diff: str  # Unified diff
+
+
+def compare_with_disk(files: Dict[Path, str], project_root: Path) -> List[FileChange]:
+    """Every file whose in-memory content differs from the disk, sorted by path."""
+    changes = []
+    for path in sorted(files):
+        new = files[path]
+        old = path.read_text(encoding='utf-8') if path.exists() else None
+        if new == old:
+            continue
+        rel = path.relative_to(project_root).as_posix()
+        diff = list(difflib.unified_diff(
+            (old or "").splitlines(keepends=True), new.splitlines(keepends=True),
+            fromfile=f"a/{rel}" if old is not None else "/dev/null", tofile=f"b/{rel}",
+        ))
+        changes.append(FileChange(
+            path=rel,
+            status="created" if old is None else "updated",
+            added=sum(1 for line in diff if line.startswith("+") and not line.startswith("+++")),
+            removed=sum(1 for line in diff if line.startswith("-") and not line.startswith("---")),
+            byte_delta=len(new.encode('utf-8')) - len((old or "").encode('utf-8')),
+            diff="".join(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n" for line in diff),
+        ))
+    return changes
+
+
+def summarize_changes(changes: List[FileChange]) -> Dict[str, int]:
+    """File, line and byte totals over compare_with_disk() results."""
+    totals = Counter(change.status for change in changes)
+    return {
+        "files": len(changes),
+        "created": totals["created"],
+        "updated": totals["updated"],
+        "added": sum(change.added for change in changes),
+        "removed": sum(change.removed for change in changes),
+        "byte_delta": sum(change.byte_delta for change in changes),
+    }
+
+
+def preview_changes(files: Dict[Path, str], project_root: Path, show_diff: bool = False) -> str:
+    """Compare in-memory output with the disk: per-file line counts and a summary, plus unified diffs."""
+    changes = compare_with_disk(files, project_root)
+    diffs = [change.diff for change in changes] if show_diff else []
+    rows = [f"  {change.status:<8} +{change.added:<5} -{change.removed:<5} {change.path}" for change in changes]
+    totals = summarize_changes(changes)
+    changed = totals["files"]
+    summary = (f"🔍 Dry run: {changed} files would change ({totals['created']} created, {totals['updated']} updated), "
+               f"+{totals['added']}/-{totals['removed']} lines, {totals['byte_delta']:+,} bytes; nothing was written")
+    return "\n".join([*diffs, *rows, summary])
+
+
+class GenerationProfile:
+    """Wall time and bytes for each generate_* call and file write, for --profile.
+
+    Writes are timed as _create_file calls; with the staged backend those only
+    buffer, so the time spent reaching the disk shows up in the "commit" phase.
+    """
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self.started = time.perf_counter()
+        self.renders: List[Dict] = []
+        self.writes: List[Dict] = []
+        self.phases: Counter = Counter()
+
+    def _rel(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.project_root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def record_render(self, feature: str, layer: str, call: str, path: Path, content: str, elapsed: float):
+        self.renders.append({
+            "feature": feature, "layer": layer, "call": call, "path": self._rel(path),
+            "ms": round(elapsed * 1000, 3), "bytes": len(content.encode('utf-8')),
+        })
+
+    def record_write(self, feature: str, layer: str, path: Path, outcome: str, size: int, elapsed: float):
+        self.writes.append({
+            "feature": feature, "layer": layer, "path": self._rel(path), "outcome": outcome,
+            "ms": round(elapsed * 1000, 3), "bytes": size if outcome in ("created", "updated") else 0,
+        })
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Time a step outside rendering and per-file writes (index check, patches, commit)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += (time.perf_counter() - start) * 1000
+
+    def layer_totals(self) -> Dict[str, Dict[str, float]]:
+        totals = {layer: Counter() for layer in LAYER_HEADERS}
+        for record in self.renders:
+            totals[record["layer"]].update(files=1, render_ms=record["ms"], render_bytes=record["bytes"])
+        for record in self.writes:
+            totals[record["layer"]].update(write_ms=record["ms"], written_bytes=record["bytes"])
+        return {
+            layer: {key: round(counts[key], 3) for key in ("files", "render_ms", "render_bytes", "write_ms", "written_bytes")}
+            for layer, counts in totals.items() if counts
+        }
+
+    def report(self) -> Dict:
+        total_ms = (time.perf_counter() - self.started) * 1000
+        accounted = (sum(record["ms"] for record in self.renders) + sum(record["ms"] for record in self.writes)
+                     + sum(self.phases.values()))
+        return {
+            "template_version": TEMPLATE_VERSION,
+            "total_ms": round(total_ms, 3),
+            # Argument parsing, template loading, path handling and output
+            "other_ms": round(max(total_ms - accounted, 0.0), 3),
+            "phases": {name: round(ms, 3) for name, ms in self.phases.items()},
+            "layers": self.layer_totals(),
+            "renders": self.renders,
+            "writes": self.writes,
+        }
+
+    @staticmethod
+    def format_summary(report: Dict) -> str:
+        lines = [f"⏱️  Profile ({report['total_ms']:.1f} ms total)",
+                 f"  {'layer':<13} {'files':>5} {'render ms':>10} {'rendered':>10} {'write ms':>9} {'written':>10}"]
+        for layer, totals in report["layers"].items():
+            lines.append(f"  {layer:<13} {totals['files']:>5} {totals['render_ms']:>10.1f} "
+                         f"{totals['render_bytes']:>10,} {totals['write_ms']:>9.1f} {totals['written_bytes']:>10,}")
+        for name, ms in [*report["phases"].items(), ("other", report["other_ms"])]:
+            lines.append(f"  {name:<13} {'':>5} {ms:>10.1f}")
+        slowest = sorted(report["renders"], key=lambda record: record["ms"], reverse=True)[:3]
+        if slowest:
+            lines.append("  slowest renders: " + ", ".join(f"{record['call']} {record['ms']:.1f} ms" for record in slowest))
+        return "\n".join(lines)
+
+
 class FeatureGenerator:
     """Generates TrackFlow feature boilerplate following Clean Architecture + DDD patterns."""
     
-    def __init__(self, feature_name: str, project_root: Path = None):
+    def __init__(self, feature_name: str, project_root: Path = None,
+                 lock: Optional[GenerationLock] = None, regenerate: bool = False, force: bool = False,
+                 backend: Optional[OutputBackend] = None, templates: Optional[TemplateRegistry] = None,
+                 queries: Iterable = (), fields: Iterable = (), paginated: bool = False,
+                 sync_ttl: int = DEFAULT_SYNC_TTL, binary_payloads: bool = False,
+                 offload_threshold: Optional[int] = None, thin: bool = False,
+                 index: Optional[ProjectIndex] = None, profile: Optional[GenerationProfile] = None,
+                 perf_budgets: Optional[Dict[str, int]] = None):
         self.feature_name = feature_name.lower()
         self.feature_class_name = self._to_pascal_case(feature_name)
+        camel_name = self._to_camel_case(self.feature_name)
+        self.naming = NamingContext(
+            snake=self.feature_name,
+            pascal=self.feature_class_name,
+            camel=camel_name,
+            snake_plural=f"{self.feature_name}s",
+            pascal_plural=f"{self.feature_class_name}s",
+            camel_plural=f"{camel_name}s",
+        )
+        self.context = self.naming._asdict()
+        self.templates = templates or TemplateRegistry.load()
+        # Every template name rendered for this feature, so --watch knows what a template edit affects
+        self.templates_used = set()
+        self.queries = [QueryShape.parse(query) for query in queries]
+        self.paginated = paginated
+        if sync_ttl < 0:
+            raise ValueError(f"Sync TTL must be zero or more seconds, got {sync_ttl}")
+        self.context["sync_ttl_seconds"] = str(sync_ttl)
+
+        declared = [FieldSpec.parse(field) for field in (fields or DEFAULT_FIELDS)]
+        self.fields = [field for field in declared if field.name not in TIMESTAMP_FIELDS]
+        overrides = {field.name: field for field in declared if field.name in TIMESTAMP_FIELDS}
+        self.timestamps = [
+            overrides.get(name, FieldSpec(name, "DateTime", storage="datetime"))._replace(type="DateTime", nullable=False)
+            for name in TIMESTAMP_FIELDS
+        ]
+        names = [field.name for field in declared]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate field(s) in field spec: {', '.join(duplicates)}")
+
+        record_fields = self.fields + self.timestamps
+        document_field_types = {
+            "id": "String",
+            "createdBy": "String",
+            **{field.name: field.document_type for field in record_fields},
+            "version": "int",
+            "isDeleted": "bool",
+        }
+        self.index_plan = IndexPlanner(
+            [
+                QueryShape(None, WATCH_BY_USER_QUERY),
+                *([QueryShape(None, PAGE_BY_USER_QUERY)] if paginated else []),
+                *self.queries,
+                *(QueryShape(None, (field.name,)) for field in record_fields if field.indexed),
+            ],
+            document_field_types,
+        )
+        self.context.update(self._field_context())
+        self.binary_payloads = binary_payloads
+        self.context.update(self._payload_context())
+        if offload_threshold is not None and offload_threshold < 0:
+            raise ValueError(f"Offload threshold must be zero or more items, got {offload_threshold}")
+        self.offload_threshold = offload_threshold
+        self.context.update(self._offload_context())
+        if thin:
+            unsupported = [
+                option for option, used in (
+                    ("--paginated", paginated),
+                    ("--query", self.queries),
+                    ("--offload-threshold", offload_threshold is not None),
+                ) if used
+            ]
+            if unsupported:
+                raise ValueError(f"--thin does not support {', '.join(unsupported)}")
+        self.thin = thin
+        self.context.update(self._thin_context())
+        unknown = sorted(set(perf_budgets or {}) - set(PERF_BUDGETS))
+        if unknown:
+            raise ValueError(f"Unknown performance budget(s) {', '.join(unknown)}; expected {', '.join(PERF_BUDGETS)}")
+        self.perf_budgets = {**PERF_BUDGETS, **(perf_budgets or {})}
+        invalid = sorted(name for name, value in self.perf_budgets.items() if isinstance(value, bool) or not isinstance(value, int) or value <= 0)
+        if invalid:
+            raise ValueError(f"Performance budget(s) {', '.join(invalid)} must be positive integers")
+        self.context.update(self._perf_context())
         self.project_root = project_root or Path.cwd()
         self.feature_root = self.project_root / "lib" / "features" / self.feature_name
+        self.lock = lock
+        self.regenerate = regenerate
+        self.force = force
+        self.backend = backend or StagedBackend(self.project_root)
+        # Files this generator created or updated, for scoping build_runner
+        self.written: List[Path] = []
+        self.index = index
+        self.profile = profile
         
+    @classmethod
+    def from_spec(cls, spec: Dict, project_root: Path, **kwargs) -> "FeatureGenerator":
+        """Build a generator from a manifest entry; kwargs (lock, backend, templates...) pass through."""
+        return cls(
+            spec["name"], project_root,
+            queries=spec.get("queries") or [],
+            fields=spec.get("fields") or [],
+            paginated=spec.get("paginated", False),
+            sync_ttl=spec.get("sync_ttl", DEFAULT_SYNC_TTL),
+            binary_payloads=spec.get("binary_payloads", False),
+            offload_threshold=spec.get("offload_threshold"),
+            thin=spec.get("thin", False),
+            perf_budgets=spec.get("perf_budgets"),
+            **kwargs,
+        )
+
     def _to_pascal_case(self, snake_str: str) -> str:
         """Convert snake_case to PascalCase."""
         return ''.join(word.capitalize() for word in snake_str.split('_'))
@@ -40,151 +1023,66 @@ class FeatureGenerator:
         """Convert CamelCase to snake_case."""
         return re.sub('(.)([A-Z][a-z]+)', r'\1_\2', camel_str).lower()
     
-    def _create_file(self, path: Path, content: str, overwrite: bool = False):
-        """Create a file with the given content."""
-        if path.exists() and not overwrite:
-            print(f"Skipping existing file: {path}")
-            return
+    def _create_file(self, path: Path, content: str, overwrite: bool = False) -> str:
+        """Create a file with the given content.
+
+        Returns the outcome: "created", "updated", "unchanged", "modified"
+        (kept because it was edited by hand) or "skipped".
+        """
+        outcome = "created"
+        if self.backend.exists(path):
+            if not (overwrite or self.regenerate):
+                print(f"Skipping existing file: {path}")
+                return "skipped"
+
+            existing = self.backend.read(path)
+            if existing == content:
+                # Leave the file (and its mtime) alone so build_runner has nothing to redo
+                if self.lock:
+                    self.lock.record(path, content, self.feature_name, self.templates.version)
+                return "unchanged"
+            if self.regenerate and not self.force and self.lock and self.lock.is_modified(path, existing):
+                print(f"Keeping locally modified file: {path}")
+                return "modified"
+            outcome = "updated"
             
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"Created: {path}")
+        self.backend.write(path, content)
+        if self.lock:
+            self.lock.record(path, content, self.feature_name, self.templates.version)
+        print(f"{outcome.capitalize()}: {path}")
+        return outcome
+
+    def _phase(self, name: str):
+        """Profile a step when --profile is on."""
+        return self.profile.phase(name) if self.profile else contextlib.nullcontext()
+
+    def _render(self, template_name: str, **extra: str) -> str:
+        """Render a registered template against this feature's naming context."""
+        context = {**self.context, **extra} if extra else self.context
+        self.templates_used.add(template_name)
+        return self.templates.render(template_name, context)
 
     def generate_domain_entity(self) -> str:
         """Generate domain entity template."""
-        return f"""import 'package:trackflow/core/domain/entity.dart';
-import 'package:trackflow/core/entities/unique_id.dart';
-
-class {self.feature_class_name} extends Entity<{self.feature_class_name}Id> {{
-  final String name;
-  final String description;
-  final UserId createdBy;
-  final DateTime createdAt;
-  final DateTime updatedAt;
-
-  const {self.feature_class_name}({{
-    required {self.feature_class_name}Id id,
-    required this.name,
-    required this.description,
-    required this.createdBy,
-    required this.createdAt,
-    required this.updatedAt,
-  }}) : super(id);
-
-  factory {self.feature_class_name}.create({{
-    required String name,
-    required String description,
-    required UserId createdBy,
-  }}) {{
-    final now = DateTime.now();
-    return {self.feature_class_name}(
-      id: {self.feature_class_name}Id(),
-      name: name,
-      description: description,
-      createdBy: createdBy,
-      createdAt: now,
-      updatedAt: now,
-    );
-  }}
-
-  {self.feature_class_name} copyWith({{
-    {self.feature_class_name}Id? id,
-    String? name,
-    String? description,
-    UserId? createdBy,
-    DateTime? createdAt,
-    DateTime? updatedAt,
-  }}) {{
-    return {self.feature_class_name}(
-      id: id ?? this.id,
-      name: name ?? this.name,
-      description: description ?? this.description,
-      createdBy: createdBy ?? this.createdBy,
-      createdAt: createdAt ?? this.createdAt,
-      updatedAt: updatedAt ?? this.updatedAt,
-    );
-  }}
-
-  bool isOwnedBy(UserId userId) {{
-    return createdBy == userId;
-  }}
-}}
-
-/// Entity ID for {self.feature_class_name}
-class {self.feature_class_name}Id extends UniqueId {{
-  {self.feature_class_name}Id([String? value]) : super(value);
-  
-  factory {self.feature_class_name}Id.fromUniqueString(String value) {{
-    return {self.feature_class_name}Id(value);
-  }}
-}}
-"""
+        return self._render("domain_entity")
 
     def generate_value_object(self, value_object_name: str) -> str:
         """Generate value object template."""
-        class_name = self._to_pascal_case(value_object_name)
-        return f"""import 'package:trackflow/core/entities/value_object.dart';
-import 'package:trackflow/core/error/value_failure.dart';
-import 'package:dartz/dartz.dart';
-
-class {class_name} extends ValueObject<String> {{
-  const {class_name}._(String value) : super(value);
-
-  factory {class_name}(String input) {{
-    final validation = {class_name}.validate(input);
-    return validation.fold(
-      (failure) => throw ArgumentError(failure.message),
-      (validValue) => {class_name}._(validValue),
-    );
-  }}
-
-  static Either<ValueFailure<String>, String> validate(String input) {{
-    if (input.isEmpty) {{
-      return Left(ValueFailure.empty(failedValue: input));
-    }}
-    
-    if (input.length < 3) {{
-      return Left(ValueFailure.shortLength(failedValue: input, min: 3));
-    }}
-    
-    if (input.length > 100) {{
-      return Left(ValueFailure.exceedingLength(failedValue: input, max: 100));
-    }}
-    
-    return Right(input);
-  }}
-}}
-"""
+        return self._render("value_object", class_name=self._to_pascal_case(value_object_name))
 
     def generate_repository_contract(self) -> str:
         """Generate repository contract template."""
-        return f"""import 'package:dartz/dartz.dart';
-import 'package:trackflow/core/entities/unique_id.dart';
-import 'package:trackflow/core/error/failures.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/entities/{self.feature_name}.dart';
-
-abstract class {self.feature_class_name}Repository {{
-  /// Get {self.feature_name} by ID
-  Future<Either<Failure, {self.feature_class_name}>> get{self.feature_class_name}ById(
-    {self.feature_class_name}Id id,
-  );
-
-  /// Get all {self.feature_name}s for a user
-  Stream<Either<Failure, List<{self.feature_class_name}>>> watch{self.feature_class_name}sByUser(
-    UserId userId,
-  );
-
-  /// Create a new {self.feature_name}
-  Future<Either<Failure, Unit>> create{self.feature_class_name}({self.feature_class_name} {self._to_camel_case(self.feature_name)});
-
-  /// Update an existing {self.feature_name}
-  Future<Either<Failure, Unit>> update{self.feature_class_name}({self.feature_class_name} {self._to_camel_case(self.feature_name)});
-
-  /// Delete a {self.feature_name}
-  Future<Either<Failure, Unit>> delete{self.feature_class_name}({self.feature_class_name}Id id);
-}}
-"""
+        page_declaration = ""
+        if self.paginated:
+            page_declaration = (
+                f"\n  /// Get one newest-first page of a user's {self.naming.snake_plural}\n"
+                f"  Future<Either<Failure, List<{self.naming.pascal}>>> get{self.naming.pascal_plural}PageByUser(\n"
+                f"    UserId userId, {{\n"
+                f"    required int offset,\n"
+                f"    required int limit,\n"
+                f"  }});"
+            )
+        return self._render("repository_contract", page_declaration=page_declaration)
 
     def generate_usecase(self, usecase_name: str, usecase_type: str = "query") -> str:
         """Generate use case template."""
@@ -196,1219 +1094,475 @@ abstract class {self.feature_class_name}Repository {{
         else:
             return_type = self.feature_class_name if "get" in usecase_name.lower() else f"List<{self.feature_class_name}>"
             
-        return f"""import 'package:dartz/dartz.dart';
-import 'package:injectable/injectable.dart';
-import 'package:trackflow/core/entities/unique_id.dart';
-import 'package:trackflow/core/error/failures.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/entities/{self.feature_name}.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/repositories/{self.feature_name}_repository.dart';
-
-class {params_class} {{
-  final UserId userId;
-  // Add more parameters as needed
-  
-  const {params_class}({{
-    required this.userId,
-  }});
-}}
-
-@lazySingleton
-class {class_name}UseCase {{
-  final {self.feature_class_name}Repository _{self._to_camel_case(self.feature_name)}Repository;
-
-  {class_name}UseCase(this._{self._to_camel_case(self.feature_name)}Repository);
-
-  Future<Either<Failure, {return_type}>> call({params_class} params) async {{
-    // TODO: Implement use case logic
-    throw UnimplementedError('Implement {class_name}UseCase.call()');
-  }}
-}}
-"""
+        return self._render(
+            "usecase",
+            class_name=class_name,
+            params_class=params_class,
+            return_type=return_type,
+        )
 
     def generate_data_model(self) -> str:
         """Generate data model (DTO) template."""
-        return f"""import 'package:trackflow/features/{self.feature_name}/domain/entities/{self.feature_name}.dart';
-import 'package:trackflow/core/entities/unique_id.dart';
-
-class {self.feature_class_name}DTO {{
-  final String id;
-  final String name;
-  final String description;
-  final String createdBy;
-  final String createdAt;
-  final String updatedAt;
-  
-  // Sync metadata fields for offline-first sync
-  final int version;
-  final DateTime? lastModified;
-
-  const {self.feature_class_name}DTO({{
-    required this.id,
-    required this.name,
-    required this.description,
-    required this.createdBy,
-    required this.createdAt,
-    required this.updatedAt,
-    this.version = 1,
-    this.lastModified,
-  }});
-
-  static const String collection = '{self.feature_name}s';
-
-  factory {self.feature_class_name}DTO.fromDomain({self.feature_class_name} {self._to_camel_case(self.feature_name)}) {{
-    return {self.feature_class_name}DTO(
-      id: {self._to_camel_case(self.feature_name)}.id.value,
-      name: {self._to_camel_case(self.feature_name)}.name,
-      description: {self._to_camel_case(self.feature_name)}.description,
-      createdBy: {self._to_camel_case(self.feature_name)}.createdBy.value,
-      createdAt: {self._to_camel_case(self.feature_name)}.createdAt.toIso8601String(),
-      updatedAt: {self._to_camel_case(self.feature_name)}.updatedAt.toIso8601String(),
-      version: 1,
-      lastModified: {self._to_camel_case(self.feature_name)}.updatedAt,
-    );
-  }}
-
-  {self.feature_class_name} toDomain() {{
-    return {self.feature_class_name}(
-      id: {self.feature_class_name}Id.fromUniqueString(id),
-      name: name,
-      description: description,
-      createdBy: UserId.fromUniqueString(createdBy),
-      createdAt: DateTime.parse(createdAt),
-      updatedAt: DateTime.parse(updatedAt),
-    );
-  }}
-
-  Map<String, dynamic> toJson() {{
-    return {{
-      'id': id,
-      'name': name,
-      'description': description,
-      'createdBy': createdBy,
-      'createdAt': createdAt,
-      'updatedAt': updatedAt,
-      'version': version,
-      'lastModified': lastModified?.toIso8601String(),
-    }};
-  }}
-
-  factory {self.feature_class_name}DTO.fromJson(Map<String, dynamic> json) {{
-    return {self.feature_class_name}DTO(
-      id: json['id'] as String,
-      name: json['name'] as String,
-      description: json['description'] as String,
-      createdBy: json['createdBy'] as String,
-      createdAt: json['createdAt'] as String,
-      updatedAt: json['updatedAt'] as String,
-      version: json['version'] as int? ?? 1,
-      lastModified: json['lastModified'] != null
-          ? DateTime.tryParse(json['lastModified'] as String)
-          : null,
-    );
-  }}
-}}
-"""
+        return self._render("data_model")
+
+    def _bytes_layout(self) -> str:
+        """16-bit layout tag for toBytes(), hashed from the ordered field signature."""
+        signature = ",".join(
+            ["id:String", "createdBy:String"]
+            + [f"{field.name}:{field.dart_type}" for field in self.fields + self.timestamps]
+            + ["version:int", "lastModified:DateTime?"]
+        )
+        return f"0x{hashlib.sha256(signature.encode()).hexdigest()[:4]}"
+
+    def _payload_context(self) -> Dict[str, str]:
+        """Queue payload snippets: JSON by default, toBytes()/fromBytes() with --binary-payloads."""
+        if not self.binary_payloads:
+            return {
+                "dto_bytes_imports": "",
+                "dto_bytes_codec": "",
+                "queue_payload": "data: dto.toJson()",
+                "executor_payload_import": "",
+                "executor_binary_decode": "",
+            }
+        record_fields = self.fields + self.timestamps
+        pascal = self.naming.pascal
+        return {
+            "dto_bytes_imports": "import 'dart:typed_data';\n\n"
+                                 "import 'package:trackflow/core/sync/data/models/compact_payload.dart';",
+            "dto_bytes_codec": self._render(
+                "fragments/dto_bytes_codec",
+                bytes_layout=self._bytes_layout(),
+                dto_to_bytes="\n".join(f"    {field.to_bytes()}" for field in record_fields),
+                dto_from_bytes="\n".join(f"      {field.name}: {field.from_bytes()}," for field in record_fields),
+            ),
+            "queue_payload": "payload: dto.toBytes()",
+            "executor_payload_import": "import 'package:trackflow/core/sync/data/models/compact_payload.dart';",
+            "executor_binary_decode": (
+                f"    if (CompactPayload.isBinary(operation.operationData)) {{\n"
+                f"      return {pascal}DTO.fromBytes(\n"
+                f"        CompactPayload.decode(operation.operationData!),\n"
+                f"      );\n"
+                f"    }}\n\n"
+            ),
+        }
+
+    def _offload_context(self) -> Dict[str, str]:
+        """List mapping snippets: inline by default, via mapOffloaded() with --offload-threshold."""
+        if self.offload_threshold is None:
+            return {
+                "offload_import": "",
+                "dto_offload_threshold": "",
+                "watch_map": "map",
+                "watch_async": "",
+                "documents_to_dtos": "documents.map((doc) => doc.toDTO()).toList()",
+                "offload_converter": "",
+                "offload_convert_many": "",
+                "dtos_to_domain": "mapper.map(dtos)",
+                "offload_domain_converter": "",
+            }
+        pascal = self.naming.pascal
+        return {
+            "offload_import": "import 'package:trackflow/core/utils/offloaded_mapping.dart';",
+            "dto_offload_threshold": (
+                f"\n  /// Lists at least this long are mapped on a worker isolate; measure with\n"
+                f"  /// test/features/{self.feature_name}/data/{self.feature_name}_mapping_benchmark_test.dart\n"
+                f"  static const int offloadThreshold = {self.offload_threshold};"
+            ),
+            "watch_map": "asyncMap",
+            "watch_async": "async ",
+            "documents_to_dtos": f"await mapOffloaded(documents, _toDTO, threshold: {pascal}DTO.offloadThreshold)",
+            "offload_converter": (
+                f"\n// Top-level so mapOffloaded can send it to a worker isolate\n"
+                f"{pascal}DTO _toDTO({pascal}Document document) => document.toDTO();"
+            ),
+            "offload_convert_many": (
+                f"        convertMany: (dtos) => mapOffloaded(\n"
+                f"          dtos,\n"
+                f"          _toDomain,\n"
+                f"          threshold: {pascal}DTO.offloadThreshold,\n"
+                f"        ),"
+            ),
+            "dtos_to_domain": "await mapper.mapAsync(dtos)",
+            "offload_domain_converter": (
+                f"\n// Top-level so mapOffloaded can send it to a worker isolate\n"
+                f"{pascal} _toDomain({pascal}DTO dto) => dto.toDomain();"
+            ),
+        }
+
+    def _thin_context(self) -> Dict[str, str]:
+        """Hooks that let --thin features extend the generic offline-first base classes."""
+        pascal = self.naming.pascal
+        if not self.thin:
+            return {
+                "dto_thin_import": "",
+                "dto_implements": "",
+                "dto_override": "",
+                "remote_create": f"create{pascal}",
+                "remote_update": f"update{pascal}",
+                "remote_delete": f"delete{pascal}",
+                "thin_payload_override": "",
+            }
+        return {
+            "dto_thin_import": "import 'package:trackflow/core/sync/data/models/offline_first_dto.dart';",
+            "dto_implements": f" implements OfflineFirstDTO<{pascal}>",
+            "dto_override": "@override\n  ",
+            "remote_create": "create",
+            "remote_update": "update",
+            "remote_delete": "delete",
+            "thin_payload_override": (
+                f"\n  @override\n  List<int>? payloadOf({pascal}DTO dto) => dto.toBytes();"
+                if self.binary_payloads else ""
+            ),
+        }
+
+    def _perf_context(self) -> Dict[str, str]:
+        """Budgets and the repository wiring that differs between full and --thin features."""
+        context = {f"perf_{name}": str(value) for name, value in self.perf_budgets.items()}
+        if self.thin:
+            context.update({
+                "perf_network_import": "",
+                "perf_network_fake": "",
+                "perf_network_argument": "",
+                "perf_watch_source": "watchByUser",
+            })
+        else:
+            context.update({
+                "perf_network_import": "import 'package:trackflow/core/network/network_state_manager.dart';",
+                "perf_network_fake": "class _FakeNetworkStateManager extends Fake implements NetworkStateManager {}\n\n",
+                "perf_network_argument": "        networkStateManager: _FakeNetworkStateManager(),",
+                "perf_watch_source": f"watch{self.naming.pascal_plural}ByUser",
+            })
+        return context
+
+    def _data_template(self, name: str) -> str:
+        # --thin swaps the self-contained data layer for subclasses of the lib/core bases
+        return f"thin/{name}" if self.thin else name
+
+    def _indexed_field(self, field: str, declaration: str) -> str:
+        lines = [f"  {annotation}" for annotation in self.index_plan.annotations(field)]
+        return "\n".join(lines + [f"  {declaration}"])
+
+    def _field_context(self) -> Dict[str, str]:
+        """Per-field snippets shared by the entity, DTO, document, BLoC and test templates."""
+        camel = self.naming.camel
+        pascal = self.naming.pascal
+        record_fields = self.fields + self.timestamps
+
+        def lines(fields: List[FieldSpec], indent: int, render: Callable[[FieldSpec], str]) -> str:
+            return "\n".join(" " * indent + render(field) for field in fields)
+
+        def document_declaration(field: FieldSpec) -> str:
+            if field.nullable:
+                return f"{field.document_type} {field.name};"
+            return f"late {field.document_type} {field.name};"
+
+        constants_are_const = all(field.type != "DateTime" for field in self.fields)
+        return {
+            "entity_fields": lines(self.fields, 2, lambda f: f"final {f.dart_type} {f.name};"),
+            "entity_constructor_params": lines(self.fields, 4, FieldSpec.constructor_param),
+            "entity_factory_params": lines(self.fields, 4, FieldSpec.factory_param),
+            "entity_arguments": lines(self.fields, 6, lambda f: f"{f.name}: {f.name},"),
+            "entity_copy_with_params": lines(self.fields, 4, lambda f: f"{f.type}? {f.name},"),
+            "entity_copy_with_arguments": lines(self.fields, 6, lambda f: f"{f.name}: {f.name} ?? this.{f.name},"),
+            "dto_fields": lines(record_fields, 2, lambda f: f"final {f.dart_type} {f.name};"),
+            "dto_constructor_params": lines(record_fields, 4, FieldSpec.constructor_param),
+            "dto_from_domain": lines(record_fields, 6, lambda f: f"{f.name}: {camel}.{f.name},"),
+            "dto_to_domain": lines(record_fields, 6, lambda f: f"{f.name}: {f.name},"),
+            "dto_to_json": lines(record_fields, 6, lambda f: f"'{f.name}': {f.to_json()},"),
+            "dto_from_json": lines(record_fields, 6, lambda f: f"{f.name}: {f.from_json()},"),
+            "benchmark_dto_arguments": lines(record_fields, 8, lambda f: f"{f.name}: {f.sample(0)},"),
+            "perf_dto_arguments": lines(record_fields, 4, lambda f: f"{f.name}: {f.sample(0)},"),
+            "dto_same_record": " &&\n        ".join(f"{f.name} == other.{f.name}" for f in record_fields),
+            "created_by_field": self._indexed_field("createdBy", "late String createdBy;"),
+            "document_fields": "\n".join(
+                self._indexed_field(field.name, document_declaration(field)) for field in record_fields
+            ),
+            "is_deleted_index": "\n".join(f"  {a}" for a in self.index_plan.annotations("isDeleted")),
+            "document_from_dto": lines(record_fields, 6, lambda f: f"..{f.name} = {f.to_document(f'dto.{f.name}')}"),
+            "document_to_dto": lines(record_fields, 6, lambda f: f"{f.name}: {f.from_document()},"),
+            "create_event_props": ", ".join(field.name for field in self.fields),
+            "create_params_from_event": lines(self.fields, 8, lambda f: f"{f.name}: event.{f.name},"),
+            "create_event_const": "const " if constants_are_const else "",
+            "test_event_constants": lines(
+                self.fields, 6,
+                lambda f: f"{'final' if f.type == 'DateTime' else 'const'} test{f.name[0].upper()}{f.name[1:]} = {f.sample(0)};",
+            ),
+            "test_event_arguments": lines(self.fields, 10, lambda f: f"{f.name}: test{f.name[0].upper()}{f.name[1:]},"),
+            "test_entity_arguments": lines(self.fields, 8, lambda f: f"{f.name}: {f.sample(0)},"),
+            "test_create_arguments": lines(self.fields, 10, lambda f: f"{f.name}: {f.sample(1)},"),
+            "test_create_expectations": lines(self.fields, 8, lambda f: f"expect({camel}.{f.name}, {f.sample(1)});"),
+            "test_copy_with_arguments": lines(self.fields, 10, lambda f: f"{f.name}: {f.sample(2)},"),
+            "test_copy_with_expectations": lines(
+                self.fields, 8, lambda f: f"expect(updated{pascal}.{f.name}, {f.sample(2)});"
+            ),
+            "test_copy_unchanged_expectations": lines(
+                self.fields, 8, lambda f: f"expect(copied{pascal}.{f.name}, test{pascal}.{f.name});"
+            ),
+            "test_different_arguments": lines(self.fields, 10, lambda f: f"{f.name}: {f.sample(3)},"),
+            "test_same_arguments": lines(self.fields, 10, lambda f: f"{f.name}: test{pascal}.{f.name},"),
+        }
+
+    def _query_method_name(self, query: QueryShape) -> str:
+        if query.name:
+            return query.name
+        keys = [self.index_plan._capitalize(field) for field in query.fields if field != "isDeleted"]
+        return f"find{self.naming.pascal_plural}By{'And'.join(keys) or 'IsDeleted'}"
 
     def generate_isar_model(self) -> str:
         """Generate Isar document model template."""
-        return f"""import 'package:isar/isar.dart';
-import 'package:trackflow/features/{self.feature_name}/data/models/{self.feature_name}_dto.dart';
-
-part '{self.feature_name}_document.g.dart';
-
-@collection
-class {self.feature_class_name}Document {{
-  Id isarId = Isar.autoIncrement;
-
-  @Index(unique: true)
-  late String id;
-
-  late String name;
-  late String description;
-  late String createdBy;
-  late String createdAt;
-  late String updatedAt;
-  
-  // Sync metadata
-  late int version;
-  DateTime? lastModified;
-  
-  // Soft delete flag
-  @Index()
-  bool isDeleted = false;
-
-  {self.feature_class_name}Document();
-
-  factory {self.feature_class_name}Document.fromDTO({self.feature_class_name}DTO dto) {{
-    return {self.feature_class_name}Document()
-      ..id = dto.id
-      ..name = dto.name
-      ..description = dto.description
-      ..createdBy = dto.createdBy
-      ..createdAt = dto.createdAt
-      ..updatedAt = dto.updatedAt
-      ..version = dto.version
-      ..lastModified = dto.lastModified;
-  }}
-
-  {self.feature_class_name}DTO toDTO() {{
-    return {self.feature_class_name}DTO(
-      id: id,
-      name: name,
-      description: description,
-      createdBy: createdBy,
-      createdAt: createdAt,
-      updatedAt: updatedAt,
-      version: version,
-      lastModified: lastModified,
-    );
-  }}
-}}
-"""
+        return self._render("isar_model")
 
     def generate_repository_impl(self) -> str:
         """Generate repository implementation template."""
-        return f"""import 'package:dartz/dartz.dart';
-import 'package:injectable/injectable.dart';
-import 'package:trackflow/core/entities/unique_id.dart';
-import 'package:trackflow/core/error/failures.dart';
-import 'package:trackflow/core/network/network_state_manager.dart';
-import 'package:trackflow/core/sync/domain/services/background_sync_coordinator.dart';
-import 'package:trackflow/core/sync/domain/services/pending_operations_manager.dart';
-import 'package:trackflow/core/sync/data/models/sync_operation_document.dart';
-import 'package:trackflow/core/utils/app_logger.dart';
-import 'package:trackflow/features/{self.feature_name}/data/datasources/{self.feature_name}_local_datasource.dart';
-import 'package:trackflow/features/{self.feature_name}/data/datasources/{self.feature_name}_remote_datasource.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/entities/{self.feature_name}.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/repositories/{self.feature_name}_repository.dart';
-import 'package:trackflow/features/{self.feature_name}/data/models/{self.feature_name}_dto.dart';
-
-@LazySingleton(as: {self.feature_class_name}Repository)
-class {self.feature_class_name}RepositoryImpl implements {self.feature_class_name}Repository {{
-  final {self.feature_class_name}LocalDataSource _localDataSource;
-  final BackgroundSyncCoordinator _backgroundSyncCoordinator;
-  final PendingOperationsManager _pendingOperationsManager;
-
-  {self.feature_class_name}RepositoryImpl({{
-    required {self.feature_class_name}RemoteDataSource remoteDataSource,
-    required {self.feature_class_name}LocalDataSource localDataSource,
-    required NetworkStateManager networkStateManager,
-    required BackgroundSyncCoordinator backgroundSyncCoordinator,
-    required PendingOperationsManager pendingOperationsManager,
-  }}) : _localDataSource = localDataSource,
-       _backgroundSyncCoordinator = backgroundSyncCoordinator,
-       _pendingOperationsManager = pendingOperationsManager;
-
-  @override
-  Future<Either<Failure, {self.feature_class_name}>> get{self.feature_class_name}ById(
-    {self.feature_class_name}Id id,
-  ) async {{
-    try {{
-      // Try local cache first
-      final result = await _localDataSource.get{self.feature_class_name}ById(id.value);
-
-      final local{self.feature_class_name} = result.fold(
-        (failure) => null,
-        (dto) => dto?.toDomain(),
-      );
-
-      // If found locally, return it and trigger background refresh
-      if (local{self.feature_class_name} != null) {{
-        // Trigger background sync for fresh data (non-blocking)
-        unawaited(
-          _backgroundSyncCoordinator.triggerBackgroundSync(
-            syncKey: '{self.feature_name}_${{id.value}}',
-          ),
-        );
-
-        return Right(local{self.feature_class_name});
-      }}
-
-      // Not found locally - trigger background fetch and return not found
-      unawaited(
-        _backgroundSyncCoordinator.triggerBackgroundSync(
-          syncKey: '{self.feature_name}_${{id.value}}',
-        ),
-      );
-
-      return Left(DatabaseFailure('{self.feature_class_name} not found in local cache'));
-    }} catch (e) {{
-      return Left(
-        DatabaseFailure('Failed to access local cache: ${{e.toString()}}'),
-      );
-    }}
-  }}
-
-  @override
-  Stream<Either<Failure, List<{self.feature_class_name}>>> watch{self.feature_class_name}sByUser(
-    UserId userId,
-  ) {{
-    try {{
-      // Trigger background sync when method is called
-      unawaited(
-        _backgroundSyncCoordinator.triggerBackgroundSync(
-          syncKey: '{self.feature_name}s_${{userId.value}}',
-        ),
-      );
-
-      // Return local data immediately + trigger background sync
-      return _localDataSource.watch{self.feature_class_name}sByUser(userId.value).map((
-        localResult,
-      ) {{
-        return localResult.fold(
-          (failure) => Left(failure),
-          (dtos) => Right(dtos.map((dto) => dto.toDomain()).toList()),
-        );
-      }});
-    }} catch (e) {{
-      return Stream.value(
-        Left(
-          DatabaseFailure('Failed to watch {self.feature_name}s: ${{e.toString()}}'),
-        ),
-      );
-    }}
-  }}
-
-  @override
-  Future<Either<Failure, Unit>> create{self.feature_class_name}({self.feature_class_name} {self._to_camel_case(self.feature_name)}) async {{
-    try {{
-      final dto = {self.feature_class_name}DTO.fromDomain({self._to_camel_case(self.feature_name)});
-
-      // Save locally first
-      await _localDataSource.cache{self.feature_class_name}(dto);
-
-      // Queue for background sync
-      final queueResult = await _pendingOperationsManager.addCreateOperation(
-        entityType: '{self.feature_name}',
-        entityId: {self._to_camel_case(self.feature_name)}.id.value,
-        data: dto.toJson(),
-        priority: SyncPriority.high,
-      );
-
-      if (queueResult.isLeft()) {{
-        final failure = queueResult.fold((l) => l, (r) => null);
-        return Left(
-          DatabaseFailure(
-            'Failed to queue sync operation: ${{failure?.message}}',
-          ),
-        );
-      }}
-
-      // Trigger background sync
-      unawaited(
-        _backgroundSyncCoordinator.triggerBackgroundSync(
-          syncKey: '{self.feature_name}s_create',
-        ),
-      );
-
-      return const Right(unit);
-    }} catch (e) {{
-      return Left(DatabaseFailure('Critical storage error: ${{e.toString()}}'));
-    }}
-  }}
-
-  @override
-  Future<Either<Failure, Unit>> update{self.feature_class_name}({self.feature_class_name} {self._to_camel_case(self.feature_name)}) async {{
-    try {{
-      final dto = {self.feature_class_name}DTO.fromDomain({self._to_camel_case(self.feature_name)});
-
-      // Update locally first
-      await _localDataSource.cache{self.feature_class_name}(dto);
-
-      // Queue for background sync
-      final queueResult = await _pendingOperationsManager.addUpdateOperation(
-        entityType: '{self.feature_name}',
-        entityId: {self._to_camel_case(self.feature_name)}.id.value,
-        data: dto.toJson(),
-        priority: SyncPriority.high,
-      );
-
-      if (queueResult.isLeft()) {{
-        final failure = queueResult.fold((l) => l, (r) => null);
-        return Left(
-          DatabaseFailure(
-            'Failed to queue sync operation: ${{failure?.message}}',
-          ),
-        );
-      }}
-
-      // Trigger background sync
-      unawaited(
-        _backgroundSyncCoordinator.triggerBackgroundSync(
-          syncKey: '{self.feature_name}s_update',
-        ),
-      );
-
-      return const Right(unit);
-    }} catch (e) {{
-      return Left(DatabaseFailure('Critical storage error: ${{e.toString()}}'));
-    }}
-  }}
-
-  @override
-  Future<Either<Failure, Unit>> delete{self.feature_class_name}({self.feature_class_name}Id id) async {{
-    try {{
-      // Soft delete locally first
-      await _localDataSource.deleteCached{self.feature_class_name}(id.value);
-
-      // Queue for background sync
-      final queueResult = await _pendingOperationsManager.addDeleteOperation(
-        entityType: '{self.feature_name}',
-        entityId: id.value,
-        priority: SyncPriority.high,
-      );
-
-      if (queueResult.isLeft()) {{
-        final failure = queueResult.fold((l) => l, (r) => null);
-        return Left(
-          DatabaseFailure(
-            'Failed to queue sync operation: ${{failure?.message}}',
-          ),
-        );
-      }}
-
-      // Trigger background sync
-      unawaited(
-        _backgroundSyncCoordinator.triggerBackgroundSync(
-          syncKey: '{self.feature_name}s_delete',
-        ),
-      );
-
-      return const Right(unit);
-    }} catch (e) {{
-      return Left(DatabaseFailure('Critical storage error: ${{e.toString()}}'));
-    }}
-  }}
-
-  // Helper method for fire-and-forget background operations
-  void unawaited(Future future) {{
-    future.catchError((error) {{
-      AppLogger.warning('Background sync trigger failed: $error', tag: '{self.feature_class_name}RepositoryImpl');
-    }});
-  }}
-}}
-"""
+        if self.thin:
+            return self._render(self._data_template("repository_impl"))
+        if not self.paginated:
+            return self._render("repository_impl", page_fields="", page_method="")
+        return self._render(
+            "repository_impl",
+            page_fields=f"\n  // Last remote page read per user, the Firestore cursor for the next one\n"
+                        f"  final Map<String, {self.naming.pascal}RemotePage> _remotePages = {{}};",
+            page_method=self._render("fragments/repository_page_method"),
+        )
 
     def generate_local_datasource(self) -> str:
         """Generate local data source template."""
-        return f"""import 'package:dartz/dartz.dart';
-import 'package:injectable/injectable.dart';
-import 'package:isar/isar.dart';
-import 'package:trackflow/core/error/failures.dart';
-import 'package:trackflow/features/{self.feature_name}/data/models/{self.feature_name}_document.dart';
-import 'package:trackflow/features/{self.feature_name}/data/models/{self.feature_name}_dto.dart';
-
-abstract class {self.feature_class_name}LocalDataSource {{
-  Future<Either<Failure, {self.feature_class_name}DTO?>> get{self.feature_class_name}ById(String id);
-  Stream<Either<Failure, List<{self.feature_class_name}DTO>>> watch{self.feature_class_name}sByUser(String userId);
-  Future<Either<Failure, Unit>> cache{self.feature_class_name}({self.feature_class_name}DTO {self._to_camel_case(self.feature_name)}DTO);
-  Future<Either<Failure, Unit>> deleteCached{self.feature_class_name}(String id);
-}}
-
-@LazySingleton(as: {self.feature_class_name}LocalDataSource)
-class {self.feature_class_name}LocalDataSourceImpl implements {self.feature_class_name}LocalDataSource {{
-  final Isar _isar;
-
-  {self.feature_class_name}LocalDataSourceImpl(this._isar);
-
-  @override
-  Future<Either<Failure, {self.feature_class_name}DTO?>> get{self.feature_class_name}ById(String id) async {{
-    try {{
-      final document = await _isar.{self._to_camel_case(self.feature_name)}Documents
-          .where()
-          .idEqualTo(id)
-          .and()
-          .isDeletedEqualTo(false)
-          .findFirst();
-
-      if (document == null) {{
-        return const Right(null);
-      }}
-
-      return Right(document.toDTO());
-    }} catch (e) {{
-      return Left(DatabaseFailure('Failed to get {self.feature_name}: ${{e.toString()}}'));
-    }}
-  }}
-
-  @override
-  Stream<Either<Failure, List<{self.feature_class_name}DTO>>> watch{self.feature_class_name}sByUser(String userId) {{
-    try {{
-      return _isar.{self._to_camel_case(self.feature_name)}Documents
-          .where()
-          .createdByEqualTo(userId)
-          .and()
-          .isDeletedEqualTo(false)
-          .watch(fireImmediately: true)
-          .map((documents) {{
-            try {{
-              final dtos = documents.map((doc) => doc.toDTO()).toList();
-              return Right<Failure, List<{self.feature_class_name}DTO>>(dtos);
-            }} catch (e) {{
-              return Left<Failure, List<{self.feature_class_name}DTO>>(
-                DatabaseFailure('Failed to convert documents: ${{e.toString()}}'),
-              );
-            }}
-          }});
-    }} catch (e) {{
-      return Stream.value(
-        Left(DatabaseFailure('Failed to watch {self.feature_name}s: ${{e.toString()}}')),
-      );
-    }}
-  }}
-
-  @override
-  Future<Either<Failure, Unit>> cache{self.feature_class_name}({self.feature_class_name}DTO {self._to_camel_case(self.feature_name)}DTO) async {{
-    try {{
-      await _isar.writeTxn(() async {{
-        await _isar.{self._to_camel_case(self.feature_name)}Documents.put(
-          {self.feature_class_name}Document.fromDTO({self._to_camel_case(self.feature_name)}DTO),
-        );
-      }});
-
-      return const Right(unit);
-    }} catch (e) {{
-      return Left(DatabaseFailure('Failed to cache {self.feature_name}: ${{e.toString()}}'));
-    }}
-  }}
-
-  @override
-  Future<Either<Failure, Unit>> deleteCached{self.feature_class_name}(String id) async {{
-    try {{
-      await _isar.writeTxn(() async {{
-        final document = await _isar.{self._to_camel_case(self.feature_name)}Documents
-            .where()
-            .idEqualTo(id)
-            .findFirst();
-
-        if (document != null) {{
-          document.isDeleted = true;
-          await _isar.{self._to_camel_case(self.feature_name)}Documents.put(document);
-        }}
-      }});
-
-      return const Right(unit);
-    }} catch (e) {{
-      return Left(DatabaseFailure('Failed to delete {self.feature_name}: ${{e.toString()}}'));
-    }}
-  }}
-}}
-"""
+        if self.thin:
+            return self._render(
+                self._data_template("local_datasource"),
+                watch_by_user_where=self.index_plan.where_clause(WATCH_BY_USER_QUERY, {"createdBy": "userId"}),
+            )
+        declarations = []
+        methods = []
+        for query in self.queries:
+            method_name = self._query_method_name(query)
+            parameters = self.index_plan.parameters(query.fields)
+            declarations.append(
+                f"  Future<Either<Failure, List<{self.naming.pascal}DTO>>> {method_name}({parameters});"
+            )
+            methods.append(self._render(
+                "fragments/local_query_method",
+                method_name=method_name,
+                params=parameters,
+                where_clause=self.index_plan.where_clause(query.fields),
+            ))
+        watch_by_user_where = self.index_plan.where_clause(WATCH_BY_USER_QUERY, {"createdBy": "userId"})
+        page_declaration = page_method = ""
+        if self.paginated:
+            page_declaration = (
+                f"  Future<Either<Failure, List<{self.naming.pascal}DTO>>> get{self.naming.pascal_plural}PageByUser("
+                f"String userId, {{required int offset, required int limit}});"
+            )
+            page_method = self._render("fragments/local_page_method", page_where=watch_by_user_where)
+        return self._render(
+            "local_datasource",
+            watch_by_user_where=watch_by_user_where,
+            query_declarations="\n".join(declarations),
+            query_methods="".join(methods),
+            page_declaration=page_declaration,
+            page_method=page_method,
+        )
 
     def generate_remote_datasource(self) -> str:
         """Generate remote data source template."""
-        return f"""import 'package:cloud_firestore/cloud_firestore.dart';
-import 'package:dartz/dartz.dart';
-import 'package:injectable/injectable.dart';
-import 'package:trackflow/core/error/failures.dart';
-import 'package:trackflow/features/{self.feature_name}/data/models/{self.feature_name}_dto.dart';
-
-abstract class {self.feature_class_name}RemoteDataSource {{
-  Future<Either<Failure, {self.feature_class_name}DTO>> get{self.feature_class_name}ById(String id);
-  Future<Either<Failure, List<{self.feature_class_name}DTO>>> get{self.feature_class_name}sByUser(String userId);
-  Future<Either<Failure, Unit>> create{self.feature_class_name}({self.feature_class_name}DTO {self._to_camel_case(self.feature_name)}DTO);
-  Future<Either<Failure, Unit>> update{self.feature_class_name}({self.feature_class_name}DTO {self._to_camel_case(self.feature_name)}DTO);
-  Future<Either<Failure, Unit>> delete{self.feature_class_name}(String id);
-}}
-
-@LazySingleton(as: {self.feature_class_name}RemoteDataSource)
-class {self.feature_class_name}RemoteDataSourceImpl implements {self.feature_class_name}RemoteDataSource {{
-  final FirebaseFirestore _firestore;
-
-  {self.feature_class_name}RemoteDataSourceImpl(this._firestore);
-
-  @override
-  Future<Either<Failure, {self.feature_class_name}DTO>> get{self.feature_class_name}ById(String id) async {{
-    try {{
-      final doc = await _firestore
-          .collection({self.feature_class_name}DTO.collection)
-          .doc(id)
-          .get();
-
-      if (!doc.exists) {{
-        return Left(ServerFailure('{self.feature_class_name} not found'));
-      }}
-
-      final data = doc.data()!;
-      data['id'] = doc.id;
-      
-      return Right({self.feature_class_name}DTO.fromJson(data));
-    }} catch (e) {{
-      return Left(ServerFailure('Failed to get {self.feature_name}: ${{e.toString()}}'));
-    }}
-  }}
-
-  @override
-  Future<Either<Failure, List<{self.feature_class_name}DTO>>> get{self.feature_class_name}sByUser(String userId) async {{
-    try {{
-      final querySnapshot = await _firestore
-          .collection({self.feature_class_name}DTO.collection)
-          .where('createdBy', isEqualTo: userId)
-          .orderBy('createdAt', descending: true)
-          .get();
-
-      final {self._to_camel_case(self.feature_name)}s = querySnapshot.docs.map((doc) {{
-        final data = doc.data();
-        data['id'] = doc.id;
-        return {self.feature_class_name}DTO.fromJson(data);
-      }}).toList();
-
-      return Right({self._to_camel_case(self.feature_name)}s);
-    }} catch (e) {{
-      return Left(ServerFailure('Failed to get {self.feature_name}s: ${{e.toString()}}'));
-    }}
-  }}
-
-  @override
-  Future<Either<Failure, Unit>> create{self.feature_class_name}({self.feature_class_name}DTO {self._to_camel_case(self.feature_name)}DTO) async {{
-    try {{
-      final data = {self._to_camel_case(self.feature_name)}DTO.toJson();
-      data.remove('id'); // Remove ID as Firestore generates it
-
-      await _firestore
-          .collection({self.feature_class_name}DTO.collection)
-          .doc({self._to_camel_case(self.feature_name)}DTO.id)
-          .set(data);
-
-      return const Right(unit);
-    }} catch (e) {{
-      return Left(ServerFailure('Failed to create {self.feature_name}: ${{e.toString()}}'));
-    }}
-  }}
-
-  @override
-  Future<Either<Failure, Unit>> update{self.feature_class_name}({self.feature_class_name}DTO {self._to_camel_case(self.feature_name)}DTO) async {{
-    try {{
-      final data = {self._to_camel_case(self.feature_name)}DTO.toJson();
-      data.remove('id'); // Remove ID as it's the document ID
-
-      await _firestore
-          .collection({self.feature_class_name}DTO.collection)
-          .doc({self._to_camel_case(self.feature_name)}DTO.id)
-          .update(data);
-
-      return const Right(unit);
-    }} catch (e) {{
-      return Left(ServerFailure('Failed to update {self.feature_name}: ${{e.toString()}}'));
-    }}
-  }}
-
-  @override
-  Future<Either<Failure, Unit>> delete{self.feature_class_name}(String id) async {{
-    try {{
-      await _firestore
-          .collection({self.feature_class_name}DTO.collection)
-          .doc(id)
-          .delete();
-
-      return const Right(unit);
-    }} catch (e) {{
-      return Left(ServerFailure('Failed to delete {self.feature_name}: ${{e.toString()}}'));
-    }}
-  }}
-}}
-"""
+        if self.thin:
+            return self._render(self._data_template("remote_datasource"))
+        if not self.paginated:
+            return self._render("remote_datasource", page_declaration="", page_method="", page_class="")
+        pascal = self.naming.pascal
+        return self._render(
+            "remote_datasource",
+            page_declaration=f"  Future<Either<Failure, {pascal}RemotePage>> get{self.naming.pascal_plural}PageByUser("
+                             f"String userId, {{required int limit, {pascal}RemotePage? after}});",
+            page_method=self._render("fragments/remote_page_method"),
+            page_class=self._render("fragments/remote_page_class"),
+        )
 
-    def generate_bloc_event(self) -> str:
-        """Generate BLoC event template."""
-        return f"""import 'package:equatable/equatable.dart';
-import 'package:trackflow/core/entities/unique_id.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/entities/{self.feature_name}.dart';
+    def generate_sync_freshness_tracker(self) -> str:
+        """Generate the shared per-syncKey sync throttle used by every generated repository."""
+        return self._render("core/sync_freshness_tracker")
 
-abstract class {self.feature_class_name}Event extends Equatable {{
-  const {self.feature_class_name}Event();
+    def generate_sync_freshness_tracker_test(self) -> str:
+        """Generate tests for the shared sync throttle."""
+        return self._render("core/sync_freshness_tracker_test")
 
-  @override
-  List<Object?> get props => [];
-}}
+    def generate_incremental_list_mapper(self) -> str:
+        """Generate the shared watch-stream mapping cache used by every generated repository."""
+        return self._render("core/incremental_list_mapper")
 
-class Watch{self.feature_class_name}sByUserEvent extends {self.feature_class_name}Event {{
-  final UserId userId;
+    def generate_incremental_list_mapper_test(self) -> str:
+        """Generate tests for the shared watch-stream mapping cache."""
+        return self._render("core/incremental_list_mapper_test")
 
-  const Watch{self.feature_class_name}sByUserEvent(this.userId);
+    def generate_tombstone_compaction(self) -> str:
+        """Generate the shared scheduler that purges synced tombstones from local data sources."""
+        return self._render("core/tombstone_compaction")
 
-  @override
-  List<Object?> get props => [userId];
-}}
+    def generate_tombstone_compaction_test(self) -> str:
+        """Generate tests for the shared tombstone compaction scheduler."""
+        return self._render("core/tombstone_compaction_test")
 
-class Create{self.feature_class_name}Event extends {self.feature_class_name}Event {{
-  final String name;
-  final String description;
+    def generate_offloaded_mapping(self) -> str:
+        """Generate the shared size-thresholded isolate mapping helper."""
+        return self._render("core/offloaded_mapping")
 
-  const Create{self.feature_class_name}Event({{
-    required this.name,
-    required this.description,
-  }});
+    def generate_mapping_benchmark_test(self) -> str:
+        """Generate the inline vs isolate mapping micro-benchmark."""
+        return self._render("mapping_benchmark_test")
 
-  @override
-  List<Object?> get props => [name, description];
-}}
+    def generate_watch_perf_test(self) -> str:
+        """Generate the watch-stream mapping budget test (1k and 10k rows)."""
+        return self._render("watch_perf_test")
 
-class Update{self.feature_class_name}Event extends {self.feature_class_name}Event {{
-  final {self.feature_class_name} {self._to_camel_case(self.feature_name)};
+    def generate_bloc_perf_test(self) -> str:
+        """Generate the BLoC state emission throughput budget test."""
+        return self._render("bloc_perf_test")
 
-  const Update{self.feature_class_name}Event(this.{self._to_camel_case(self.feature_name)});
+    def generate_offline_first_base(self, name: str) -> str:
+        """Generate one of the generic base classes --thin features extend (see OFFLINE_FIRST_BASES)."""
+        return self._render(f"core/{name}")
 
-  @override
-  List<Object?> get props => [{self._to_camel_case(self.feature_name)}];
-}}
+    def generate_fixture_seeder(self) -> str:
+        """Generate the shared fixture loading helpers behind the seed entry point."""
+        return self._render("core/fixture_seeder")
 
-class Delete{self.feature_class_name}Event extends {self.feature_class_name}Event {{
-  final {self.feature_class_name}Id {self._to_camel_case(self.feature_name)}Id;
+    def generate_seed_step(self) -> str:
+        """Generate this feature's step in the seed entry point: Isar putAll plus optional Firestore."""
+        return self._render("fragments/seed_feature_step")
 
-  const Delete{self.feature_class_name}Event(this.{self._to_camel_case(self.feature_name)}Id);
+    def seed_imports(self) -> List[str]:
+        """Imports the seed entry point needs for this feature's step."""
+        models = f"package:trackflow/features/{self.feature_name}/data/models"
+        return [
+            f"import '{models}/{self.feature_name}_document.dart';",
+            f"import '{models}/{self.feature_name}_dto.dart';",
+        ]
 
-  @override
-  List<Object?> get props => [{self._to_camel_case(self.feature_name)}Id];
-}}
+    def generate_operation_executor(self) -> str:
+        """Generate the batched sync operation executor."""
+        return self._render("operation_executor")
 
-class {self.feature_class_name}sUpdatedEvent extends {self.feature_class_name}Event {{
-  final List<{self.feature_class_name}> {self._to_camel_case(self.feature_name)}s;
+    def register_operation_executor(self) -> str:
+        """Register this feature's executor in operation_executor_factory.dart.
 
-  const {self.feature_class_name}sUpdatedEvent(this.{self._to_camel_case(self.feature_name)}s);
+        Goes through the output backend so it lands in the same commit as the
+        generated files. The factory is hand-maintained, so it is not tracked
+        in the lock file. Returns "updated", "unchanged" or "skipped".
+        """
+        path = self.project_root / EXECUTOR_FACTORY_PATH
+        executor = f"{self.feature_class_name}OperationExecutor"
+        if not self.backend.exists(path):
+            print(f"⚠️  {EXECUTOR_FACTORY_PATH} not found; register {executor} manually")
+            return "skipped"
+
+        source = self.backend.read(path)
+        try:
+            updated = register_operation_executor(source, self.naming)
+        except ValueError as e:
+            print(f"⚠️  {e}; register {executor} manually")
+            return "skipped"
+        if updated == source:
+            return "unchanged"
+        self.backend.write(path, updated)
+        print(f"Registered: {executor} in {path}")
+        return "updated"
+
+    def register_isar_schema(self) -> str:
+        """Add this feature's DocumentSchema to app_module.dart.
+
+        Like register_operation_executor(), the edit goes through the output
+        backend and the module is not tracked in the lock file. Returns
+        "updated", "unchanged" or "skipped".
+        """
+        path = self.project_root / APP_MODULE_PATH
+        schema = f"{self.feature_class_name}DocumentSchema"
+        if not self.backend.exists(path):
+            print(f"⚠️  {APP_MODULE_PATH} not found; add {schema} manually")
+            return "skipped"
+
+        source = self.backend.read(path)
+        try:
+            updated = register_isar_schema(source, self.naming)
+        except ValueError as e:
+            print(f"⚠️  {e}; add {schema} manually")
+            return "skipped"
+        if updated == source:
+            return "unchanged"
+        self.backend.write(path, updated)
+        print(f"Registered: {schema} in {path}")
+        return "updated"
+
+    def build_filters(self) -> List[str]:
+        """build_runner outputs that depend on the files this generator wrote."""
+        outputs = []
+        for path in self.written:
+            if path.name.endswith("_document.dart"):
+                outputs.append(path.with_name(f"{path.stem}.g.dart"))
+            elif path.name.endswith("_bloc_test.dart"):
+                outputs.append(path.with_name(f"{path.stem}.mocks.dart"))
+        if any(path.is_relative_to(self.project_root / "lib") for path in self.written):
+            outputs.append(self.project_root / INJECTION_CONFIG_PATH)
+        return [path.relative_to(self.project_root).as_posix() for path in outputs]
+
+    def generate_page_usecase(self) -> str:
+        """Generate the --paginated page query use case."""
+        return self._render("paginated/page_usecase")
+
+    def _presentation_template(self, name: str) -> str:
+        # --paginated swaps the watch-everything BLoC for a windowed, load-more one
+        return f"paginated/{name}" if self.paginated else name
 
-  @override
-  List<Object?> get props => [{self._to_camel_case(self.feature_name)}s];
-}}
-"""
+    def generate_bloc_event(self) -> str:
+        """Generate BLoC event template."""
+        return self._render(self._presentation_template("bloc_event"))
 
     def generate_bloc_state(self) -> str:
         """Generate BLoC state template."""
-        return f"""import 'package:equatable/equatable.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/entities/{self.feature_name}.dart';
-
-abstract class {self.feature_class_name}State extends Equatable {{
-  const {self.feature_class_name}State();
-
-  @override
-  List<Object?> get props => [];
-}}
-
-class {self.feature_class_name}Initial extends {self.feature_class_name}State {{
-  const {self.feature_class_name}Initial();
-}}
-
-class {self.feature_class_name}Loading extends {self.feature_class_name}State {{
-  const {self.feature_class_name}Loading();
-}}
-
-class {self.feature_class_name}sLoaded extends {self.feature_class_name}State {{
-  final List<{self.feature_class_name}> {self._to_camel_case(self.feature_name)}s;
-  final bool isSyncing;
-  final double? syncProgress;
-
-  const {self.feature_class_name}sLoaded({{
-    required this.{self._to_camel_case(self.feature_name)}s,
-    this.isSyncing = false,
-    this.syncProgress,
-  }});
-
-  @override
-  List<Object?> get props => [{self._to_camel_case(self.feature_name)}s, isSyncing, syncProgress];
-
-  {self.feature_class_name}sLoaded copyWith({{
-    List<{self.feature_class_name}>? {self._to_camel_case(self.feature_name)}s,
-    bool? isSyncing,
-    double? syncProgress,
-  }}) {{
-    return {self.feature_class_name}sLoaded(
-      {self._to_camel_case(self.feature_name)}s: {self._to_camel_case(self.feature_name)}s ?? this.{self._to_camel_case(self.feature_name)}s,
-      isSyncing: isSyncing ?? this.isSyncing,
-      syncProgress: syncProgress ?? this.syncProgress,
-    );
-  }}
-}}
-
-class {self.feature_class_name}OperationSuccess extends {self.feature_class_name}State {{
-  final String message;
-
-  const {self.feature_class_name}OperationSuccess(this.message);
-
-  @override
-  List<Object?> get props => [message];
-}}
-
-class {self.feature_class_name}Error extends {self.feature_class_name}State {{
-  final String message;
-
-  const {self.feature_class_name}Error(this.message);
-
-  @override
-  List<Object?> get props => [message];
-}}
-"""
+        return self._render(self._presentation_template("bloc_state"))
 
     def generate_bloc(self) -> str:
         """Generate BLoC template."""
-        return f"""import 'dart:async';
-import 'package:flutter_bloc/flutter_bloc.dart';
-import 'package:injectable/injectable.dart';
-import 'package:dartz/dartz.dart';
-import 'package:trackflow/core/app_flow/data/session_storage.dart';
-import 'package:trackflow/core/entities/unique_id.dart';
-import 'package:trackflow/core/error/failures.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/entities/{self.feature_name}.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/usecases/create_{self.feature_name}_usecase.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/usecases/update_{self.feature_name}_usecase.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/usecases/delete_{self.feature_name}_usecase.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/usecases/watch_{self.feature_name}s_by_user_usecase.dart';
-import '{self.feature_name}_event.dart';
-import '{self.feature_name}_state.dart';
-
-@injectable
-class {self.feature_class_name}Bloc extends Bloc<{self.feature_class_name}Event, {self.feature_class_name}State> {{
-  final Create{self.feature_class_name}UseCase _create{self.feature_class_name}UseCase;
-  final Update{self.feature_class_name}UseCase _update{self.feature_class_name}UseCase;
-  final Delete{self.feature_class_name}UseCase _delete{self.feature_class_name}UseCase;
-  final Watch{self.feature_class_name}sByUserUseCase _watch{self.feature_class_name}sByUserUseCase;
-  final SessionStorage _sessionStorage;
-
-  StreamSubscription<Either<Failure, List<{self.feature_class_name}>>>? _{self._to_camel_case(self.feature_name)}sSubscription;
-  List<{self.feature_class_name}> _current{self.feature_class_name}s = [];
-
-  {self.feature_class_name}Bloc({{
-    required Create{self.feature_class_name}UseCase create{self.feature_class_name}UseCase,
-    required Update{self.feature_class_name}UseCase update{self.feature_class_name}UseCase,
-    required Delete{self.feature_class_name}UseCase delete{self.feature_class_name}UseCase,
-    required Watch{self.feature_class_name}sByUserUseCase watch{self.feature_class_name}sByUserUseCase,
-    required SessionStorage sessionStorage,
-  }}) : _create{self.feature_class_name}UseCase = create{self.feature_class_name}UseCase,
-        _update{self.feature_class_name}UseCase = update{self.feature_class_name}UseCase,
-        _delete{self.feature_class_name}UseCase = delete{self.feature_class_name}UseCase,
-        _watch{self.feature_class_name}sByUserUseCase = watch{self.feature_class_name}sByUserUseCase,
-        _sessionStorage = sessionStorage,
-        super(const {self.feature_class_name}Initial()) {{
-    on<Watch{self.feature_class_name}sByUserEvent>(_onWatch{self.feature_class_name}sByUser);
-    on<Create{self.feature_class_name}Event>(_onCreate{self.feature_class_name});
-    on<Update{self.feature_class_name}Event>(_onUpdate{self.feature_class_name});
-    on<Delete{self.feature_class_name}Event>(_onDelete{self.feature_class_name});
-    on<{self.feature_class_name}sUpdatedEvent>(_on{self.feature_class_name}sUpdated);
-  }}
-
-  void _onWatch{self.feature_class_name}sByUser(
-    Watch{self.feature_class_name}sByUserEvent event,
-    Emitter<{self.feature_class_name}State> emit,
-  ) async {{
-    await _{self._to_camel_case(self.feature_name)}sSubscription?.cancel();
-    emit(const {self.feature_class_name}Loading());
-
-    _{self._to_camel_case(self.feature_name)}sSubscription = _watch{self.feature_class_name}sByUserUseCase
-        .call(Watch{self.feature_class_name}sByUserParams(userId: event.userId))
-        .listen((either) {{
-          either.fold(
-            (failure) => add({self.feature_class_name}sUpdatedEvent([])),
-            ({self._to_camel_case(self.feature_name)}s) => add({self.feature_class_name}sUpdatedEvent({self._to_camel_case(self.feature_name)}s)),
-          );
-        }});
-  }}
-
-  Future<void> _onCreate{self.feature_class_name}(
-    Create{self.feature_class_name}Event event,
-    Emitter<{self.feature_class_name}State> emit,
-  ) async {{
-    emit(const {self.feature_class_name}Loading());
-
-    final userId = await _sessionStorage.getUserId();
-    if (userId == null) {{
-      emit(const {self.feature_class_name}Error('User not authenticated'));
-      return;
-    }}
-
-    final result = await _create{self.feature_class_name}UseCase.call(
-      Create{self.feature_class_name}Params(
-        name: event.name,
-        description: event.description,
-        createdBy: UserId.fromUniqueString(userId),
-      ),
-    );
-
-    result.fold(
-      (failure) => emit({self.feature_class_name}Error(failure.message)),
-      (_) => emit(const {self.feature_class_name}OperationSuccess('{self.feature_class_name} created successfully')),
-    );
-  }}
-
-  Future<void> _onUpdate{self.feature_class_name}(
-    Update{self.feature_class_name}Event event,
-    Emitter<{self.feature_class_name}State> emit,
-  ) async {{
-    emit(const {self.feature_class_name}Loading());
-
-    final result = await _update{self.feature_class_name}UseCase.call(
-      Update{self.feature_class_name}Params({self._to_camel_case(self.feature_name)}: event.{self._to_camel_case(self.feature_name)}),
-    );
-
-    result.fold(
-      (failure) => emit({self.feature_class_name}Error(failure.message)),
-      (_) => emit(const {self.feature_class_name}OperationSuccess('{self.feature_class_name} updated successfully')),
-    );
-  }}
-
-  Future<void> _onDelete{self.feature_class_name}(
-    Delete{self.feature_class_name}Event event,
-    Emitter<{self.feature_class_name}State> emit,
-  ) async {{
-    emit(const {self.feature_class_name}Loading());
-
-    final result = await _delete{self.feature_class_name}UseCase.call(
-      Delete{self.feature_class_name}Params({self._to_camel_case(self.feature_name)}Id: event.{self._to_camel_case(self.feature_name)}Id),
-    );
-
-    result.fold(
-      (failure) => emit({self.feature_class_name}Error(failure.message)),
-      (_) => emit(const {self.feature_class_name}OperationSuccess('{self.feature_class_name} deleted successfully')),
-    );
-  }}
-
-  void _on{self.feature_class_name}sUpdated(
-    {self.feature_class_name}sUpdatedEvent event,
-    Emitter<{self.feature_class_name}State> emit,
-  ) {{
-    _current{self.feature_class_name}s = event.{self._to_camel_case(self.feature_name)}s;
-    
-    emit({self.feature_class_name}sLoaded(
-      {self._to_camel_case(self.feature_name)}s: _current{self.feature_class_name}s,
-      isSyncing: false,
-      syncProgress: null,
-    ));
-  }}
-
-  @override
-  Future<void> close() {{
-    _{self._to_camel_case(self.feature_name)}sSubscription?.cancel();
-    return super.close();
-  }}
-}}
-"""
+        return self._render(self._presentation_template("bloc"))
 
     def generate_entity_test(self) -> str:
         """Generate entity test template."""
-        return f"""import 'package:flutter_test/flutter_test.dart';
-import 'package:trackflow/core/entities/unique_id.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/entities/{self.feature_name}.dart';
-
-void main() {{
-  group('{self.feature_class_name} Entity Tests', () {{
-    late {self.feature_class_name} test{self.feature_class_name};
-    late UserId userId;
-
-    setUp(() {{
-      userId = UserId.fromUniqueString('user-123');
-      
-      test{self.feature_class_name} = {self.feature_class_name}(
-        id: {self.feature_class_name}Id.fromUniqueString('{self.feature_name}-123'),
-        name: 'Test {self.feature_class_name}',
-        description: 'Test Description',
-        createdBy: userId,
-        createdAt: DateTime.now(),
-        updatedAt: DateTime.now(),
-      );
-    }});
-
-    group('factory constructor', () {{
-      test('should create {self.feature_name} with generated ID and timestamps', () {{
-        // Act
-        final {self._to_camel_case(self.feature_name)} = {self.feature_class_name}.create(
-          name: 'New {self.feature_class_name}',
-          description: 'New Description',
-          createdBy: userId,
-        );
-
-        // Assert
-        expect({self._to_camel_case(self.feature_name)}.name, 'New {self.feature_class_name}');
-        expect({self._to_camel_case(self.feature_name)}.description, 'New Description');
-        expect({self._to_camel_case(self.feature_name)}.createdBy, userId);
-        expect({self._to_camel_case(self.feature_name)}.id.value, isNotEmpty);
-        expect({self._to_camel_case(self.feature_name)}.createdAt, isA<DateTime>());
-        expect({self._to_camel_case(self.feature_name)}.updatedAt, isA<DateTime>());
-      }});
-    }});
-
-    group('copyWith', () {{
-      test('should return new instance with updated values', () {{
-        // Act
-        final updated{self.feature_class_name} = test{self.feature_class_name}.copyWith(
-          name: 'Updated Name',
-          description: 'Updated Description',
-        );
-
-        // Assert
-        expect(updated{self.feature_class_name}.name, 'Updated Name');
-        expect(updated{self.feature_class_name}.description, 'Updated Description');
-        expect(updated{self.feature_class_name}.id, test{self.feature_class_name}.id);
-        expect(updated{self.feature_class_name}.createdBy, test{self.feature_class_name}.createdBy);
-      }});
-
-      test('should return same instance if no values changed', () {{
-        // Act
-        final copied{self.feature_class_name} = test{self.feature_class_name}.copyWith();
-
-        // Assert
-        expect(copied{self.feature_class_name}.name, test{self.feature_class_name}.name);
-        expect(copied{self.feature_class_name}.description, test{self.feature_class_name}.description);
-        expect(copied{self.feature_class_name}.id, test{self.feature_class_name}.id);
-      }});
-    }});
-
-    group('isOwnedBy', () {{
-      test('should return true when user is owner', () {{
-        // Act & Assert
-        expect(test{self.feature_class_name}.isOwnedBy(userId), true);
-      }});
-
-      test('should return false when user is not owner', () {{
-        // Arrange
-        final otherUserId = UserId.fromUniqueString('other-user-456');
-
-        // Act & Assert
-        expect(test{self.feature_class_name}.isOwnedBy(otherUserId), false);
-      }});
-    }});
-
-    group('equality', () {{
-      test('should be equal when IDs are the same', () {{
-        // Arrange
-        final other{self.feature_class_name} = {self.feature_class_name}(
-          id: test{self.feature_class_name}.id,
-          name: 'Different Name',
-          description: 'Different Description',
-          createdBy: UserId.fromUniqueString('different-user'),
-          createdAt: DateTime.now(),
-          updatedAt: DateTime.now(),
-        );
-
-        // Act & Assert
-        expect(test{self.feature_class_name}, equals(other{self.feature_class_name}));
-        expect(test{self.feature_class_name}.hashCode, equals(other{self.feature_class_name}.hashCode));
-      }});
-
-      test('should not be equal when IDs are different', () {{
-        // Arrange
-        final other{self.feature_class_name} = {self.feature_class_name}(
-          id: {self.feature_class_name}Id.fromUniqueString('different-id'),
-          name: test{self.feature_class_name}.name,
-          description: test{self.feature_class_name}.description,
-          createdBy: test{self.feature_class_name}.createdBy,
-          createdAt: test{self.feature_class_name}.createdAt,
-          updatedAt: test{self.feature_class_name}.updatedAt,
-        );
-
-        // Act & Assert
-        expect(test{self.feature_class_name}, isNot(equals(other{self.feature_class_name})));
-      }});
-    }});
-  }});
-}}
-"""
+        return self._render("entity_test")
 
     def generate_bloc_test(self) -> str:
         """Generate BLoC test template."""
-        return f"""import 'package:bloc_test/bloc_test.dart';
-import 'package:dartz/dartz.dart';
-import 'package:flutter_test/flutter_test.dart';
-import 'package:mockito/annotations.dart';
-import 'package:mockito/mockito.dart';
-import 'package:trackflow/core/app_flow/data/session_storage.dart';
-import 'package:trackflow/core/entities/unique_id.dart';
-import 'package:trackflow/core/error/failures.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/entities/{self.feature_name}.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/usecases/create_{self.feature_name}_usecase.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/usecases/update_{self.feature_name}_usecase.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/usecases/delete_{self.feature_name}_usecase.dart';
-import 'package:trackflow/features/{self.feature_name}/domain/usecases/watch_{self.feature_name}s_by_user_usecase.dart';
-import 'package:trackflow/features/{self.feature_name}/presentation/bloc/{self.feature_name}_bloc.dart';
-import 'package:trackflow/features/{self.feature_name}/presentation/bloc/{self.feature_name}_event.dart';
-import 'package:trackflow/features/{self.feature_name}/presentation/bloc/{self.feature_name}_state.dart';
-
-import '{self.feature_name}_bloc_test.mocks.dart';
-
-@GenerateMocks([
-  Create{self.feature_class_name}UseCase,
-  Update{self.feature_class_name}UseCase,
-  Delete{self.feature_class_name}UseCase,
-  Watch{self.feature_class_name}sByUserUseCase,
-  SessionStorage,
-])
-void main() {{
-  group('{self.feature_class_name}Bloc', () {{
-    late {self.feature_class_name}Bloc {self._to_camel_case(self.feature_name)}Bloc;
-    late MockCreate{self.feature_class_name}UseCase mockCreate{self.feature_class_name}UseCase;
-    late MockUpdate{self.feature_class_name}UseCase mockUpdate{self.feature_class_name}UseCase;
-    late MockDelete{self.feature_class_name}UseCase mockDelete{self.feature_class_name}UseCase;
-    late MockWatch{self.feature_class_name}sByUserUseCase mockWatch{self.feature_class_name}sByUserUseCase;
-    late MockSessionStorage mockSessionStorage;
-
-    setUp(() {{
-      mockCreate{self.feature_class_name}UseCase = MockCreate{self.feature_class_name}UseCase();
-      mockUpdate{self.feature_class_name}UseCase = MockUpdate{self.feature_class_name}UseCase();
-      mockDelete{self.feature_class_name}UseCase = MockDelete{self.feature_class_name}UseCase();
-      mockWatch{self.feature_class_name}sByUserUseCase = MockWatch{self.feature_class_name}sByUserUseCase();
-      mockSessionStorage = MockSessionStorage();
-
-      {self._to_camel_case(self.feature_name)}Bloc = {self.feature_class_name}Bloc(
-        create{self.feature_class_name}UseCase: mockCreate{self.feature_class_name}UseCase,
-        update{self.feature_class_name}UseCase: mockUpdate{self.feature_class_name}UseCase,
-        delete{self.feature_class_name}UseCase: mockDelete{self.feature_class_name}UseCase,
-        watch{self.feature_class_name}sByUserUseCase: mockWatch{self.feature_class_name}sByUserUseCase,
-        sessionStorage: mockSessionStorage,
-      );
-    }});
-
-    tearDown(() {{
-      {self._to_camel_case(self.feature_name)}Bloc.close();
-    }});
-
-    test('initial state is {self.feature_class_name}Initial', () {{
-      expect({self._to_camel_case(self.feature_name)}Bloc.state, equals(const {self.feature_class_name}Initial()));
-    }});
-
-    group('Create{self.feature_class_name}Event', () {{
-      const testName = 'Test {self.feature_class_name}';
-      const testDescription = 'Test Description';
-      const testUserId = 'user-123';
-
-      blocTest<{self.feature_class_name}Bloc, {self.feature_class_name}State>(
-        'emits [{self.feature_class_name}Loading, {self.feature_class_name}OperationSuccess] when creation succeeds',
-        build: () {{
-          when(mockSessionStorage.getUserId())
-              .thenAnswer((_) async => testUserId);
-          when(mockCreate{self.feature_class_name}UseCase.call(any))
-              .thenAnswer((_) async => const Right(unit));
-          return {self._to_camel_case(self.feature_name)}Bloc;
-        }},
-        act: (bloc) => bloc.add(const Create{self.feature_class_name}Event(
-          name: testName,
-          description: testDescription,
-        )),
-        expect: () => [
-          const {self.feature_class_name}Loading(),
-          const {self.feature_class_name}OperationSuccess('{self.feature_class_name} created successfully'),
-        ],
-        verify: (_) {{
-          verify(mockSessionStorage.getUserId()).called(1);
-          verify(mockCreate{self.feature_class_name}UseCase.call(any)).called(1);
-        }},
-      );
-
-      blocTest<{self.feature_class_name}Bloc, {self.feature_class_name}State>(
-        'emits [{self.feature_class_name}Loading, {self.feature_class_name}Error] when user is not authenticated',
-        build: () {{
-          when(mockSessionStorage.getUserId())
-              .thenAnswer((_) async => null);
-          return {self._to_camel_case(self.feature_name)}Bloc;
-        }},
-        act: (bloc) => bloc.add(const Create{self.feature_class_name}Event(
-          name: testName,
-          description: testDescription,
-        )),
-        expect: () => [
-          const {self.feature_class_name}Loading(),
-          const {self.feature_class_name}Error('User not authenticated'),
-        ],
-        verify: (_) {{
-          verify(mockSessionStorage.getUserId()).called(1);
-          verifyNever(mockCreate{self.feature_class_name}UseCase.call(any));
-        }},
-      );
-
-      blocTest<{self.feature_class_name}Bloc, {self.feature_class_name}State>(
-        'emits [{self.feature_class_name}Loading, {self.feature_class_name}Error] when creation fails',
-        build: () {{
-          when(mockSessionStorage.getUserId())
-              .thenAnswer((_) async => testUserId);
-          when(mockCreate{self.feature_class_name}UseCase.call(any))
-              .thenAnswer((_) async => const Left(ServerFailure('Creation failed')));
-          return {self._to_camel_case(self.feature_name)}Bloc;
-        }},
-        act: (bloc) => bloc.add(const Create{self.feature_class_name}Event(
-          name: testName,
-          description: testDescription,
-        )),
-        expect: () => [
-          const {self.feature_class_name}Loading(),
-          const {self.feature_class_name}Error('Creation failed'),
-        ],
-      );
-    }});
-
-    group('Watch{self.feature_class_name}sByUserEvent', () {{
-      final testUserId = UserId.fromUniqueString('user-123');
-      final test{self.feature_class_name}s = [
-        {self.feature_class_name}.create(
-          name: 'Test {self.feature_class_name} 1',
-          description: 'Description 1',
-          createdBy: testUserId,
-        ),
-        {self.feature_class_name}.create(
-          name: 'Test {self.feature_class_name} 2',
-          description: 'Description 2',
-          createdBy: testUserId,
-        ),
-      ];
-
-      blocTest<{self.feature_class_name}Bloc, {self.feature_class_name}State>(
-        'emits [{self.feature_class_name}Loading, {self.feature_class_name}sLoaded] when watching succeeds',
-        build: () {{
-          when(mockWatch{self.feature_class_name}sByUserUseCase.call(any))
-              .thenAnswer((_) => Stream.value(Right(test{self.feature_class_name}s)));
-          return {self._to_camel_case(self.feature_name)}Bloc;
-        }},
-        act: (bloc) => bloc.add(Watch{self.feature_class_name}sByUserEvent(testUserId)),
-        expect: () => [
-          const {self.feature_class_name}Loading(),
-          {self.feature_class_name}sLoaded(
-            {self._to_camel_case(self.feature_name)}s: test{self.feature_class_name}s,
-            isSyncing: false,
-            syncProgress: null,
-          ),
-        ],
-      );
-
-      blocTest<{self.feature_class_name}Bloc, {self.feature_class_name}State>(
-        'emits [{self.feature_class_name}Loading, {self.feature_class_name}sLoaded] with empty list when watching fails',
-        build: () {{
-          when(mockWatch{self.feature_class_name}sByUserUseCase.call(any))
-              .thenAnswer((_) => Stream.value(const Left(ServerFailure('Watch failed'))));
-          return {self._to_camel_case(self.feature_name)}Bloc;
-        }},
-        act: (bloc) => bloc.add(Watch{self.feature_class_name}sByUserEvent(testUserId)),
-        expect: () => [
-          const {self.feature_class_name}Loading(),
-          const {self.feature_class_name}sLoaded(
-            {self._to_camel_case(self.feature_name)}s: [],
-            isSyncing: false,
-            syncProgress: null,
-          ),
-        ],
-      );
-    }});
-  }});
-}}
-"""
+        return self._render(self._presentation_template("bloc_test"))
+
+    def render_all_files(self, skip_presentation: bool = False, with_tests: bool = False,
+                         with_perf_tests: bool = False) -> List[GeneratedFile]:
+        """Render every feature file in memory, in write order."""
+        files = []
+
+        def add(layer: str, path: Path, generate: Callable[..., str], *args: str):
+            start = time.perf_counter()
+            content = generate(*args)
+            if self.profile:
+                self.profile.record_render(self.feature_name, layer, generate.__name__, path, content,
+                                           time.perf_counter() - start)
+            files.append(GeneratedFile(layer, path, content))
 
-    def generate_all_files(self, skip_presentation: bool = False, with_tests: bool = False) -> None:
-        """Generate all feature files."""
-        print(f"🚀 Generating feature '{self.feature_name}' with Clean Architecture + DDD structure...")
-        
         # Domain layer
-        print("\n📋 Generating Domain Layer...")
-        self._create_file(
+        add("domain",
             self.feature_root / "domain" / "entities" / f"{self.feature_name}.dart",
-            self.generate_domain_entity()
+            self.generate_domain_entity
         )
         
-        # Value objects (optional - can be customized)
-        value_objects = ["name", "description"]  # Common value objects
+        # Value objects for the text fields (can be customized)
+        value_objects = [self._to_snake_case(field.name) for field in self.fields if field.type == "String"]
         for vo in value_objects:
-            self._create_file(
+            add("domain",
                 self.feature_root / "domain" / "value_objects" / f"{self.feature_name}_{vo}.dart",
-                self.generate_value_object(f"{self.feature_name}_{vo}")
+                self.generate_value_object, f"{self.feature_name}_{vo}"
             )
         
         # Repository contract
-        self._create_file(
+        add("domain",
             self.feature_root / "domain" / "repositories" / f"{self.feature_name}_repository.dart",
-            self.generate_repository_contract()
+            self.generate_repository_contract
         )
         
         # Use cases
@@ -1427,83 +1581,749 @@ void main() {{
             elif uc_name == "get_by_id":
                 uc_file_name = f"get_{self.feature_name}_by_id_usecase.dart"
                 
-            self._create_file(
+            add("domain",
                 self.feature_root / "domain" / "usecases" / uc_file_name,
-                self.generate_usecase(f"{uc_name}_{self.feature_name}", uc_type)
+                self.generate_usecase, f"{uc_name}_{self.feature_name}", uc_type
+            )
+
+        if self.paginated:
+            add("domain",
+                self.feature_root / "domain" / "usecases" / f"get_{self.naming.snake_plural}_page_usecase.dart",
+                self.generate_page_usecase
             )
         
         # Data layer
-        print("\n💾 Generating Data Layer...")
-        self._create_file(
+        add("data",
             self.feature_root / "data" / "models" / f"{self.feature_name}_dto.dart",
-            self.generate_data_model()
+            self.generate_data_model
         )
         
-        self._create_file(
+        add("data",
             self.feature_root / "data" / "models" / f"{self.feature_name}_document.dart",
-            self.generate_isar_model()
+            self.generate_isar_model
         )
         
-        self._create_file(
+        add("data",
             self.feature_root / "data" / "datasources" / f"{self.feature_name}_local_datasource.dart",
-            self.generate_local_datasource()
+            self.generate_local_datasource
         )
         
-        self._create_file(
+        add("data",
             self.feature_root / "data" / "datasources" / f"{self.feature_name}_remote_datasource.dart",
-            self.generate_remote_datasource()
+            self.generate_remote_datasource
         )
         
-        self._create_file(
+        add("data",
+            self.project_root / "lib" / "core" / "sync" / "domain" / "executors" / f"{self.feature_name}_operation_executor.dart",
+            self.generate_operation_executor
+        )
+        
+        # Shared by all generated features; only written if no feature has created it yet
+        add("data",
+            self.project_root / "lib" / "core" / "sync" / "domain" / "services" / "sync_freshness_tracker.dart",
+            self.generate_sync_freshness_tracker
+        )
+        
+        add("data",
+            self.project_root / "lib" / "core" / "utils" / "incremental_list_mapper.dart",
+            self.generate_incremental_list_mapper
+        )
+
+        add("data",
+            self.project_root / "lib" / "core" / "sync" / "domain" / "services" / "tombstone_compaction.dart",
+            self.generate_tombstone_compaction
+        )
+
+        if self.thin:
+            sync_data = self.project_root / "lib" / "core" / "sync" / "data"
+            for directory, name in OFFLINE_FIRST_BASES:
+                add("data", sync_data / directory / f"{name}.dart", self.generate_offline_first_base, name)
+
+        if self.offload_threshold is not None:
+            add("data",
+                self.project_root / "lib" / "core" / "utils" / "offloaded_mapping.dart",
+                self.generate_offloaded_mapping
+            )
+        
+        add("data",
             self.feature_root / "data" / "repositories" / f"{self.feature_name}_repository_impl.dart",
-            self.generate_repository_impl()
+            self.generate_repository_impl
         )
         
         # Presentation layer
         if not skip_presentation:
-            print("\n🎨 Generating Presentation Layer...")
-            self._create_file(
+            add("presentation",
                 self.feature_root / "presentation" / "bloc" / f"{self.feature_name}_event.dart",
-                self.generate_bloc_event()
+                self.generate_bloc_event
             )
             
-            self._create_file(
+            add("presentation",
                 self.feature_root / "presentation" / "bloc" / f"{self.feature_name}_state.dart",
-                self.generate_bloc_state()
+                self.generate_bloc_state
             )
             
-            self._create_file(
+            add("presentation",
                 self.feature_root / "presentation" / "bloc" / f"{self.feature_name}_bloc.dart",
-                self.generate_bloc()
+                self.generate_bloc
             )
         
         # Test files
         if with_tests:
-            print("\n🧪 Generating Test Files...")
             test_root = self.project_root / "test" / "features" / self.feature_name
             
-            self._create_file(
+            add("tests",
                 test_root / "domain" / "entities" / f"{self.feature_name}_test.dart",
-                self.generate_entity_test()
+                self.generate_entity_test
             )
             
             if not skip_presentation:
-                self._create_file(
+                add("tests",
                     test_root / "presentation" / "bloc" / f"{self.feature_name}_bloc_test.dart",  
-                    self.generate_bloc_test()
+                    self.generate_bloc_test
                 )
+
+            add("tests",
+                self.project_root / "test" / "core" / "sync" / "domain" / "services" / "sync_freshness_tracker_test.dart",
+                self.generate_sync_freshness_tracker_test
+            )
+
+            add("tests",
+                self.project_root / "test" / "core" / "utils" / "incremental_list_mapper_test.dart",
+                self.generate_incremental_list_mapper_test
+            )
+
+            add("tests",
+                self.project_root / "test" / "core" / "sync" / "domain" / "services" / "tombstone_compaction_test.dart",
+                self.generate_tombstone_compaction_test
+            )
+
+            if self.offload_threshold is not None:
+                add("tests",
+                    test_root / "data" / f"{self.feature_name}_mapping_benchmark_test.dart",
+                    self.generate_mapping_benchmark_test
+                )
+
+        # Performance budget tests
+        if with_perf_tests:
+            test_root = self.project_root / "test" / "features" / self.feature_name
+
+            add("tests",
+                test_root / "data" / f"{self.feature_name}_watch_perf_test.dart",
+                self.generate_watch_perf_test
+            )
+
+            # The paginated BLoC pages through a use case instead of watching a stream
+            if not skip_presentation and not self.paginated:
+                add("tests",
+                    test_root / "presentation" / "bloc" / f"{self.feature_name}_bloc_perf_test.dart",
+                    self.generate_bloc_perf_test
+                )
+
+        return files
+
+    def write_files(self, files: List[GeneratedFile], headers: bool = True) -> Counter:
+        """Write rendered files, printing a header per layer. Returns a count per outcome."""
+        outcomes = Counter()
+        current_layer = None
+        for generated in files:
+            if headers and generated.layer != current_layer:
+                current_layer = generated.layer
+                print(f"\n{LAYER_HEADERS[current_layer]}")
+            start = time.perf_counter()
+            outcome = self._create_file(generated.path, generated.content)
+            if self.profile:
+                self.profile.record_write(self.feature_name, generated.layer, generated.path, outcome,
+                                          len(generated.content.encode('utf-8')), time.perf_counter() - start)
+            if outcome in ("created", "updated"):
+                self.written.append(generated.path)
+            outcomes[outcome] += 1
+        return outcomes
+
+    @staticmethod
+    def print_write_report(outcomes: Counter):
+        """Summarise a --regenerate run."""
+        written = outcomes["created"] + outcomes["updated"]
+        print(f"\n♻️  Regenerated: {written} written, {outcomes['unchanged']} unchanged (skipped)")
+        if outcomes["modified"]:
+            print(f"⚠️  Kept {outcomes['modified']} locally modified files (use --force to overwrite)")
+
+    @staticmethod
+    def print_build_step(project_root: Path, build_filters: List[str], run_build: bool, steps: List[str]) -> int:
+        """Run the scoped build_runner, or put its command first in the next steps."""
+        if run_build:
+            return run_build_runner(project_root, build_filters)
+        if build_filters:
+            steps.insert(0, f"Run: {shlex.join(build_runner_command(build_filters))}")
+        return 0
+
+    def generate_all_files(self, skip_presentation: bool = False, with_tests: bool = False,
+                           run_build: bool = False, dry_run: bool = False, show_diff: bool = False,
+                           with_perf_tests: bool = False) -> int:
+        """Generate all feature files. Returns the build_runner exit code with run_build, else 0.
+
+        With dry_run the backend must be a MemoryBackend: the run is previewed
+        against the disk and neither the files nor the lock are written.
+        """
+        print(f"🚀 Generating feature '{self.feature_name}' with Clean Architecture + DDD structure...")
+        
+        files = self.render_all_files(skip_presentation, with_tests, with_perf_tests)
+        if self.index:
+            with self._phase("index_check"):
+                self.index.check(files)
+        outcomes = self.write_files(files)
+        with self._phase("register"):
+            self.register_operation_executor()
+            schema_outcome = self.register_isar_schema()
+        if dry_run:
+            with self._phase("preview"):
+                print(f"\n{preview_changes(self.backend.files, self.project_root, show_diff)}")
+            return 0
+        with self._phase("commit"):
+            self.backend.commit()
+        if self.lock:
+            with self._phase("lock_save"):
+                self.lock.save()
+        if self.regenerate:
+            self.print_write_report(outcomes)
         
         print(f"\n✅ Feature '{self.feature_name}' generated successfully!")
         print(f"📁 Generated files in: {self.feature_root}")
         
         # Next steps
+        steps = []
+        if schema_outcome == "skipped":
+            steps.append(f"Add {self.feature_class_name}DocumentSchema to app_module.dart")
+        steps += [
+            "Customize the generated entities and value objects as needed",
+            "Implement the TODO sections in use cases",
+            "Create UI screens and widgets in presentation/screens/",
+            "Write comprehensive tests",
+        ]
+        with self._phase("build_runner"):
+            build_status = self.print_build_step(self.project_root, self.build_filters(), run_build, steps)
         print(f"\n📝 Next Steps:")
-        print(f"1. Run: flutter packages pub run build_runner build --delete-conflicting-outputs")
-        print(f"2. Add {self.feature_class_name}DocumentSchema to app_module.dart")
-        print(f"3. Customize the generated entities and value objects as needed")
-        print(f"4. Implement the TODO sections in use cases")
-        print(f"5. Create UI screens and widgets in presentation/screens/")
-        print(f"6. Write comprehensive tests")
+        for number, step in enumerate(steps, 1):
+            print(f"{number}. {step}")
+        return build_status
+
+    @staticmethod
+    def generate_batch(specs: List[Dict], project_root: Path, jobs: Optional[int] = None,
+                       regenerate: bool = False, force: bool = False,
+                       backend: Optional[OutputBackend] = None, templates_dir: Optional[Path] = None,
+                       run_build: bool = False, index: Optional[ProjectIndex] = None,
+                       dry_run: bool = False, show_diff: bool = False,
+                       profile: Optional[GenerationProfile] = None) -> int:
+        """Render many features in parallel worker processes, then write the batch together.
+
+        Returns the build_runner exit code with run_build, else 0. Workers
+        profile their own renders, so render times in a profile overlap.
+        """
+        print(f"🚀 Generating {len(specs)} features from manifest...")
+
+        render_start = time.perf_counter()
+        jobs = min(jobs or os.cpu_count() or 1, len(specs))
+        work = [(spec, project_root, templates_dir, profile is not None) for spec in specs]
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(_render_feature, work))
+        else:
+            results = [_render_feature(item) for item in work]
+        render_total = time.perf_counter() - render_start
+        if profile:
+            profile.renders.extend(record for _, _, renders in results for record in renders)
+        if index:
+            # One pass over every feature also catches two manifest entries that clash
+            with profile.phase("index_check") if profile else contextlib.nullcontext():
+                index.check([generated for files, _, _ in results for generated in files])
+
+        lock = GenerationLock(project_root)
+        backend = backend or StagedBackend(project_root)
+        summary = []
+        batch_outcomes = Counter()
+        build_filters: Dict[str, None] = {}
+        unregistered = []
+        for spec, (files, render_time, _) in zip(specs, results):
+            # Same spec as the render phase, so registration sees the same options
+            generator = FeatureGenerator.from_spec(
+                spec, project_root, lock=lock, regenerate=regenerate, force=force, backend=backend,
+                templates=TemplateRegistry.load(templates_dir), profile=profile
+            )
+            print(f"\n📦 {generator.feature_name}")
+            write_start = time.perf_counter()
+            outcomes = generator.write_files(files)
+            with generator._phase("register"):
+                generator.register_operation_executor()
+                schema_outcome = generator.register_isar_schema()
+            if schema_outcome == "skipped":
+                unregistered.append(f"{generator.feature_class_name}DocumentSchema")
+            build_filters.update(dict.fromkeys(generator.build_filters()))
+            batch_outcomes.update(outcomes)
+            written = outcomes["created"] + outcomes["updated"]
+            summary.append((generator.feature_name, len(files), written, render_time, time.perf_counter() - write_start))
+        if dry_run:
+            print(f"\n{preview_changes(backend.files, project_root, show_diff)}")
+            return 0
+        commit_start = time.perf_counter()
+        backend.commit()
+        commit_time = time.perf_counter() - commit_start
+        lock_start = time.perf_counter()
+        lock.save()
+        if profile:
+            profile.phases["commit"] += commit_time * 1000
+            profile.phases["lock_save"] += (time.perf_counter() - lock_start) * 1000
+
+        print(f"\n📊 Batch summary ({render_total * 1000:.0f} ms wall-clock rendering, {jobs} workers)")
+        print(f"  {'feature':<24} {'files':>5} {'written':>7} {'render ms':>10} {'stage ms':>9}")
+        for name, total, written, render_time, write_time in summary:
+            print(f"  {name:<24} {total:>5} {written:>7} {render_time * 1000:>10.1f} {write_time * 1000:>9.1f}")
+        print(f"  committed batch to disk in {commit_time * 1000:.1f} ms")
+        if regenerate:
+            FeatureGenerator.print_write_report(batch_outcomes)
+
+        print(f"\n✅ Generated {len(summary)} features successfully!")
+        steps = [f"Add {', '.join(unregistered)} to app_module.dart"] if unregistered else []
+        with profile.phase("build_runner") if profile else contextlib.nullcontext():
+            build_status = FeatureGenerator.print_build_step(project_root, list(build_filters), run_build, steps)
+        if steps:
+            print(f"\n📝 Next Steps:")
+            for number, step in enumerate(steps, 1):
+                print(f"{number}. {step}")
+        return build_status
+
+
+def _render_feature(work: Tuple[Dict, Path, Optional[Path], bool]) -> Tuple[List[GeneratedFile], float, List[Dict]]:
+    """Process-pool entry point: render one manifest entry and time it, with per-call records if profiled."""
+    spec, project_root, templates_dir, profiled = work
+    start = time.perf_counter()
+    profile = GenerationProfile(project_root) if profiled else None
+    # Each worker process loads and compiles the templates once, then reuses them
+    generator = FeatureGenerator.from_spec(
+        spec, project_root, templates=TemplateRegistry.load(templates_dir), profile=profile
+    )
+    files = generator.render_all_files(
+        skip_presentation=spec.get("skip_presentation", False),
+        with_tests=spec.get("with_tests", False),
+        with_perf_tests=spec.get("with_perf_tests", False),
+    )
+    return files, time.perf_counter() - start, profile.renders if profile else []
+
+
+def load_manifest(path: Path) -> List[Dict]:
+    """Load a feature manifest (YAML or JSON) into a list of feature specs.
+
+    The manifest holds a ``features`` list whose entries are either a feature
+    name or a mapping with ``name`` plus per-feature options; top-level
+    ``defaults`` apply to every entry.
+    """
+    text = path.read_text(encoding='utf-8')
+    if path.suffix in (".yaml", ".yml"):
+        if yaml is None:
+            raise ValueError("PyYAML is required for YAML manifests (pip install pyyaml), or use a .json manifest")
+        data = yaml.safe_load(text) or {}
+    else:
+        data = json.loads(text)
+
+    if isinstance(data, list):
+        data = {"features": data}
+    defaults = data.get("defaults") or {}
+    specs = []
+    for entry in data.get("features") or []:
+        spec = dict(defaults)
+        spec.update({"name": entry} if isinstance(entry, str) else entry)
+        if not FEATURE_NAME_PATTERN.match(str(spec.get("name", ""))):
+            raise ValueError(f"Invalid feature name in manifest: {spec.get('name')!r} (expected snake_case)")
+        specs.append(spec)
+    if not specs:
+        raise ValueError(f"No features listed in manifest {path}")
+    return specs
+
+# JSON-RPC 2.0 error codes; GENERATION_FAILED is in the range reserved for servers
+RPC_PARSE_ERROR = -32700
+RPC_INVALID_REQUEST = -32600
+RPC_METHOD_NOT_FOUND = -32601
+RPC_INVALID_PARAMS = -32602
+RPC_INTERNAL_ERROR = -32603
+RPC_GENERATION_FAILED = -32000
+# Feature params that must be JSON booleans when present
+RPC_BOOL_PARAMS = (
+    "skip_presentation", "with_tests", "with_perf_tests", "regenerate", "force",
+    "paginated", "binary_payloads", "thin",
+)
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class GeneratorService:
+    """Warm generator behind --serve: line-delimited JSON-RPC 2.0 over stdio or a Unix socket.
+
+    Templates and the project index are loaded once and reused across
+    requests, so a request pays only for rendering. Feature params take the
+    same keys as a manifest entry. Generator progress goes to stderr; stdout
+    carries only responses.
+    """
+
+    def __init__(self, project_root: Path, templates_dir: Optional[Path] = None, use_index: bool = True):
+        self.project_root = project_root
+        self.templates = TemplateRegistry.load(templates_dir)
+        self.index = ProjectIndex.load(project_root) if use_index else None
+        self.running = True
+        self.methods: Dict[str, Callable[[Dict], Dict]] = {
+            "generate": self.generate,
+            "preview": self.preview,
+            "diff": self.diff,
+            "list_features": self.list_features,
+            "shutdown": self.shutdown,
+        }
+
+    @staticmethod
+    def _spec(params: Dict) -> Dict:
+        """Check the shape of feature params, so bad input is -32602 rather than an internal error."""
+        if not isinstance(params, dict):
+            raise RpcError(RPC_INVALID_PARAMS, "params must be an object")
+        name = params.get("name")
+        if not isinstance(name, str) or not FEATURE_NAME_PATTERN.match(name):
+            raise RpcError(RPC_INVALID_PARAMS, "params.name must be a snake_case feature name")
+        for flag in RPC_BOOL_PARAMS:
+            if not isinstance(params.get(flag, False), bool):
+                raise RpcError(RPC_INVALID_PARAMS, f"params.{flag} must be a boolean")
+        for option in ("sync_ttl", "offload_threshold"):
+            value = params.get(option)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+                raise RpcError(RPC_INVALID_PARAMS, f"params.{option} must be an integer")
+
+        def is_strings(value) -> bool:
+            return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+        fields = params.get("fields") or []
+        if not isinstance(fields, list) or not all(isinstance(field, (str, dict)) for field in fields):
+            raise RpcError(RPC_INVALID_PARAMS, "params.fields must be a list of field strings or objects")
+        queries = params.get("queries") or []
+        if not isinstance(queries, list) or not all(
+            isinstance(query, str) or is_strings(query)
+            or (isinstance(query, dict) and is_strings(query.get("fields", [])))
+            for query in queries
+        ):
+            raise RpcError(RPC_INVALID_PARAMS, "params.queries must be a list of field lists or comma-separated strings")
+        budgets = params.get("perf_budgets") or {}
+        if not isinstance(budgets, dict) or not all(
+            isinstance(value, int) and not isinstance(value, bool) for value in budgets.values()
+        ):
+            raise RpcError(RPC_INVALID_PARAMS, "params.perf_budgets must map budget names to integers")
+        return params
+
+    def _run(self, params: Dict, backend: OutputBackend, persist_index: bool) -> Tuple[FeatureGenerator, Counter, str]:
+        """Render one feature into backend, with the same checks and patches as a CLI run."""
+        spec = self._spec(params)
+        if self.index:
+            self.index.refresh(persist_index)
+        generator = FeatureGenerator.from_spec(
+            spec, self.project_root,
+            lock=GenerationLock(self.project_root),
+            regenerate=spec.get("regenerate", False), force=spec.get("force", False),
+            backend=backend, templates=self.templates,
+        )
+        files = generator.render_all_files(
+            spec.get("skip_presentation", False), spec.get("with_tests", False), spec.get("with_perf_tests", False)
+        )
+        if self.index:
+            self.index.check(files)
+        outcomes = generator.write_files(files)
+        generator.register_operation_executor()
+        schema_outcome = generator.register_isar_schema()
+        return generator, outcomes, schema_outcome
+
+    def generate(self, params: Dict) -> Dict:
+        generator, outcomes, schema_outcome = self._run(params, StagedBackend(self.project_root), persist_index=True)
+        generator.backend.commit()
+        generator.lock.save()
+        return {
+            "feature": generator.feature_name,
+            "written": [path.relative_to(self.project_root).as_posix() for path in generator.written],
+            "outcomes": dict(outcomes),
+            "schema_registered": schema_outcome != "skipped",
+            "build_command": build_runner_command(generator.build_filters()),
+        }
+
+    def preview(self, params: Dict, with_diff: bool = False) -> Dict:
+        generator, _, schema_outcome = self._run(params, MemoryBackend(read_through=True), persist_index=False)
+        changes = compare_with_disk(generator.backend.files, self.project_root)
+        files = [change._asdict() for change in changes]
+        if not with_diff:
+            for entry in files:
+                del entry["diff"]
+        return {
+            "feature": generator.feature_name,
+            "files": files,
+            "summary": summarize_changes(changes),
+            "schema_registered": schema_outcome != "skipped",
+        }
+
+    def diff(self, params: Dict) -> Dict:
+        return self.preview(params, with_diff=True)
+
+    def list_features(self, params: Dict) -> Dict:
+        generated = Counter(entry["feature"] for entry in GenerationLock(self.project_root).files.values())
+        features_dir = self.project_root / "lib" / "features"
+        names = sorted(path.name for path in features_dir.iterdir() if path.is_dir()) if features_dir.is_dir() else []
+        return {"features": [{"name": name, "generated_files": generated[name]} for name in names]}
+
+    def shutdown(self, params: Dict) -> Dict:
+        self.running = False
+        return {}
+
+    def handle(self, request) -> Optional[Dict]:
+        """Answer one decoded request; None for notifications (requests without an id)."""
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or not isinstance(request.get("method"), str):
+            return self._error(request.get("id") if isinstance(request, dict) else None,
+                               RPC_INVALID_REQUEST, "Expected a JSON-RPC 2.0 request object")
+        params = request.get("params", {})
+        start = time.perf_counter()
+        try:
+            method = self.methods.get(request["method"])
+            if method is None:
+                raise RpcError(RPC_METHOD_NOT_FOUND, f"Unknown method '{request['method']}' "
+                                                     f"(expected one of {', '.join(self.methods)})")
+            if not isinstance(params, dict):
+                raise RpcError(RPC_INVALID_PARAMS, "params must be an object")
+            with contextlib.redirect_stdout(sys.stderr):
+                result = method(params)
+        except RpcError as e:
+            response = self._error(request.get("id"), e.code, str(e))
+        except ValueError as e:
+            response = self._error(request.get("id"), RPC_GENERATION_FAILED, str(e))
+        except Exception as e:
+            response = self._error(request.get("id"), RPC_INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+        else:
+            result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            response = {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+        return response if "id" in request else None
+
+    @staticmethod
+    def _error(request_id, code: int, message: str) -> Dict:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    def serve_stream(self, reader: io.TextIOBase, write: Callable[[str], None]):
+        """Answer one request per line until EOF or shutdown."""
+        for line in iter(reader.readline, ""):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = self._error(None, RPC_PARSE_ERROR, f"Invalid JSON: {e}")
+            else:
+                response = self.handle(request)
+            if response is not None:
+                write(json.dumps(response) + "\n")
+            if not self.running:
+                break
+
+    def serve(self, socket_path: Optional[Path] = None):
+        """Serve stdin/stdout, or one client at a time on a Unix socket, until shutdown."""
+        if socket_path is None:
+            stdout = sys.stdout
+
+            def write(text: str):
+                stdout.write(text)
+                stdout.flush()
+
+            self.serve_stream(sys.stdin, write)
+            return
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise ValueError("--socket needs Unix domain sockets; use stdio on this platform")
+
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                reader = io.TextIOWrapper(self.rfile, encoding='utf-8')
+                service.serve_stream(reader, lambda text: self.wfile.write(text.encode('utf-8')))
+
+        socket_path.unlink(missing_ok=True)
+        with socketserver.UnixStreamServer(str(socket_path), Handler) as server:
+            print(f"🛰️  Listening on {socket_path}", file=sys.stderr)
+            try:
+                while self.running:
+                    server.handle_request()
+            finally:
+                socket_path.unlink(missing_ok=True)
+
+
+# --watch timing: seconds between snapshots when polling, and how long to collect
+# a burst of events (editors often write a file more than once per save)
+WATCH_POLL_INTERVAL = 0.5
+WATCH_DEBOUNCE = 0.1
+WATCH_EVENT_TYPES = ("created", "modified", "moved", "deleted")
+
+
+class FeatureWatcher:
+    """--watch: regenerate features whose manifest entry, or any template they render, changes.
+
+    Templates stay compiled and the project index stays warm between cycles,
+    and only affected features are re-rendered. Writes follow the --regenerate
+    rules: unchanged files are left alone and hand-edited ones are kept unless
+    force is set. Changes are reported by watchdog (inotify on Linux) when it
+    is installed, otherwise by polling mtimes.
+    """
+
+    def __init__(self, specs: List[Dict], project_root: Path, manifest: Optional[Path] = None,
+                 defaults: Optional[Dict] = None, templates_dir: Optional[Path] = None,
+                 force: bool = False, index: Optional[ProjectIndex] = None):
+        self.project_root = project_root
+        self.manifest = manifest.resolve() if manifest else None
+        self.defaults = defaults or {}
+        self.templates_dir = templates_dir.resolve() if templates_dir else None
+        self.template_dirs = [BUILTIN_TEMPLATES_DIR, *([self.templates_dir] if self.templates_dir else [])]
+        self.force = force
+        self.templates = TemplateRegistry.load(templates_dir)
+        self.index = index
+        self.specs: Dict[str, Dict] = {spec["name"]: spec for spec in specs}
+        # Template names each feature rendered last cycle
+        self.templates_used: Dict[str, set] = {}
+
+    def regenerate(self, names: List[str]):
+        """Re-render names and write the files whose content changed, as one staged commit."""
+        start = time.perf_counter()
+        lock = GenerationLock(self.project_root)
+        backend = StagedBackend(self.project_root)
+        rendered = []
+        for name in names:
+            spec = self.specs[name]
+            generator = FeatureGenerator.from_spec(
+                spec, self.project_root, lock=lock, regenerate=True, force=self.force,
+                backend=backend, templates=self.templates,
+            )
+            rendered.append((generator, generator.render_all_files(
+                spec.get("skip_presentation", False), spec.get("with_tests", False),
+                spec.get("with_perf_tests", False),
+            )))
+        if self.index:
+            self.index.refresh()
+            self.index.check([generated for _, files in rendered for generated in files])
+
+        outcomes = Counter()
+        for generator, files in rendered:
+            outcomes.update(generator.write_files(files, headers=False))
+            generator.register_operation_executor()
+            generator.register_isar_schema()
+            self.templates_used[generator.feature_name] = generator.templates_used
+        backend.commit()
+        lock.save()
+
+        written = outcomes["created"] + outcomes["updated"]
+        print(f"♻️  {', '.join(names)}: {written} written, {outcomes['unchanged']} unchanged "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        if outcomes["modified"]:
+            print(f"⚠️  Kept {outcomes['modified']} locally modified files (use --force to overwrite)")
+
+    def affected_by(self, changed: Iterable[Path]) -> List[str]:
+        """Reload whatever changed and return the features that must be re-rendered."""
+        affected = set()
+        changed = set(changed)
+        if self.manifest in changed:
+            specs = {spec["name"]: {**self.defaults, **spec} for spec in load_manifest(self.manifest)}
+            for name in self.specs.keys() - specs.keys():
+                print(f"ℹ️  {name} was removed from the manifest; its files were left in place")
+            affected |= {name for name, spec in specs.items() if self.specs.get(name) != spec}
+            self.specs = specs
+
+        template_names = {self._template_name(path) for path in changed} - {None}
+        if template_names:
+            self.templates = TemplateRegistry.reload(self.templates_dir)
+            affected |= {
+                name for name in self.specs
+                if name not in self.templates_used or self.templates_used[name] & template_names
+            }
+        return sorted(affected)
+
+    def _template_name(self, path: Path) -> Optional[str]:
+        if not path.name.endswith(TEMPLATE_SUFFIX):
+            return None
+        for directory in self.template_dirs:
+            if directory in path.parents:
+                return path.relative_to(directory).as_posix()[:-len(TEMPLATE_SUFFIX)]
+        return None
+
+    def _watched(self, path: Path) -> bool:
+        return path == self.manifest or self._template_name(path) is not None
+
+    def _snapshot(self) -> Dict[Path, int]:
+        paths = [self.manifest] if self.manifest else []
+        for directory in self.template_dirs:
+            paths.extend(directory.rglob(f"*{TEMPLATE_SUFFIX}"))
+        return {path: path.stat().st_mtime_ns for path in paths if path.exists()}
+
+    def _polled_changes(self) -> Iterable[set]:
+        previous = self._snapshot()
+        while True:
+            time.sleep(WATCH_POLL_INTERVAL)
+            current = self._snapshot()
+            changed = {path for path in previous.keys() | current.keys() if previous.get(path) != current.get(path)}
+            previous = current
+            if changed:
+                yield changed
+
+    def _observed_changes(self) -> Iterable[set]:
+        events: "queue.Queue[Path]" = queue.Queue()
+
+        class Handler:
+            """watchdog only needs dispatch(); atomic saves arrive as moves onto the watched path."""
+
+            def dispatch(self, event):
+                # Newer watchdog also reports opens and closes, which reloading the templates causes
+                if event.event_type not in WATCH_EVENT_TYPES:
+                    return
+                for path in (event.src_path, getattr(event, "dest_path", "")):
+                    if path:
+                        events.put(Path(os.fsdecode(path)))
+
+        observer = Observer()
+        if self.manifest:
+            observer.schedule(Handler(), str(self.manifest.parent), recursive=False)
+        for directory in self.template_dirs:
+            observer.schedule(Handler(), str(directory), recursive=True)
+        observer.start()
+        try:
+            while True:
+                try:
+                    changed = {events.get(timeout=1.0)}
+                except queue.Empty:
+                    continue
+                deadline = time.monotonic() + WATCH_DEBOUNCE
+                while time.monotonic() < deadline:
+                    try:
+                        changed.add(events.get(timeout=max(deadline - time.monotonic(), 0)))
+                    except queue.Empty:
+                        break
+                changed = {path for path in changed if self._watched(path)}
+                if changed:
+                    yield changed
+        finally:
+            observer.stop()
+            observer.join()
+
+    def watch(self):
+        """Generate everything once, then regenerate on every change until interrupted."""
+        watched = [*([self.manifest] if self.manifest else []), *self.template_dirs]
+        mode = "watchdog" if Observer else f"polling every {WATCH_POLL_INTERVAL}s; pip install watchdog for inotify"
+        try:
+            self.regenerate(list(self.specs))
+            print(f"👀 Watching {', '.join(map(str, watched))} ({mode}). Press Ctrl+C to stop.")
+            for changed in self._observed_changes() if Observer else self._polled_changes():
+                try:
+                    names = self.affected_by(changed)
+                    if names:
+                        self.regenerate(names)
+                except Exception as e:
+                    # Keep watching; the next save usually fixes a half-edited manifest or template
+                    print(f"❌ Error regenerating: {e}")
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -1514,14 +2334,55 @@ Examples:
   python generate_feature.py notifications
   python generate_feature.py user_settings --with-tests
   python generate_feature.py analytics --skip-presentation
+  python generate_feature.py --manifest features.yaml --jobs 4
+  python generate_feature.py notifications --regenerate
+  python generate_feature.py tasks --query status,isDeleted --query name
+  python generate_feature.py tasks --field title:String --field dueDate:DateTime?:indexed --field done:bool
+  python generate_feature.py messages --paginated
+  python generate_feature.py events --binary-payloads
+  python generate_feature.py tracks --offload-threshold 2000 --with-tests
+  python generate_feature.py tags --thin
+  python generate_feature.py tracks --with-perf-tests --perf-budget watch_10k_ms=300
+  python generate_feature.py notes --diff
+  python generate_feature.py notes --profile --cprofile notes.pstats
+  python generate_feature.py --serve --socket /tmp/trackflow_gen.sock
+  python generate_feature.py --manifest features.yaml --watch --templates-dir my_templates
+
+Manifest format (YAML, or JSON with the same shape):
+  defaults:
+    with_tests: true
+  features:
+    - notifications
+    - name: analytics
+      skip_presentation: true
+      paginated: true
+      fields:
+        - name: title
+          type: String
+        - {name: createdAt, type: DateTime, storage: epoch, indexed: true}
+      queries:
+        - [title, isDeleted]
         """
     )
     
     parser.add_argument(
         "feature_name",
+        nargs="?",
         help="Name of the feature to generate (snake_case)"
     )
     
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="Generate every feature listed in a YAML/JSON manifest in one run"
+    )
+    
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Worker processes used to render manifest features (default: CPU count)"
+    )
+    
     parser.add_argument(
         "--skip-presentation", 
         action="store_true",
@@ -1534,6 +2395,161 @@ Examples:
         help="Generate test files"
     )
     
+    parser.add_argument(
+        "--regenerate",
+        action="store_true",
+        help=f"Rewrite existing generated files whose rendered output changed (tracked in {LOCK_FILE_NAME})"
+    )
+    
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="With --regenerate, also overwrite files that were edited since they were generated"
+    )
+    
+    parser.add_argument(
+        "--query",
+        action="append",
+        default=[],
+        metavar="FIELD[,FIELD...]",
+        help="Declare an equality query on the Isar document; composite indexes and "
+             "where() clauses are planned from all declared queries (repeatable)"
+    )
+    
+    parser.add_argument(
+        "--field",
+        action="append",
+        default=[],
+        metavar="NAME:TYPE[?][:indexed][:STORAGE]",
+        help="Declare a domain field emitted in the entity, DTO and Isar document (repeatable; "
+             f"default: {' '.join(DEFAULT_FIELDS)}). TYPE is one of {', '.join(FIELD_TYPES)}; "
+             f"DateTime STORAGE is one of {', '.join(DATETIME_STORAGE)}. Redeclare createdAt/updatedAt "
+             "to change their storage or indexing"
+    )
+    
+    parser.add_argument(
+        "--paginated",
+        action="store_true",
+        help="Emit cursor-paged Firestore reads, offset/limit Isar page queries and a "
+             "load-more BLoC that keeps a bounded window of items in memory"
+    )
+    
+    parser.add_argument(
+        "--sync-ttl",
+        type=int,
+        default=DEFAULT_SYNC_TTL,
+        metavar="SECONDS",
+        help="How long a background sync key stays fresh; repeated reads within it do not "
+             f"re-trigger sync (default: {DEFAULT_SYNC_TTL})"
+    )
+    
+    parser.add_argument(
+        "--binary-payloads",
+        action="store_true",
+        help="Emit versioned toBytes()/fromBytes() DTO codecs and queue sync operations "
+             "as compact binary payloads instead of JSON"
+    )
+    
+    parser.add_argument(
+        "--offload-threshold",
+        type=int,
+        metavar="ITEMS",
+        help="Map watched and queried lists of at least ITEMS rows on a worker isolate "
+             "(compute) and emit a mapping benchmark test with --with-tests"
+    )
+    
+    parser.add_argument(
+        "--thin",
+        action="store_true",
+        help="Emit small per-feature subclasses of generic offline-first repository and "
+             "data source bases, written to lib/core on first use"
+    )
+    
+    parser.add_argument(
+        "--with-perf-tests",
+        action="store_true",
+        help="Emit Dart tests that time watch mapping at 1k/10k rows and BLoC emission "
+             "throughput against performance budgets"
+    )
+    
+    parser.add_argument(
+        "--perf-budget",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Override a --with-perf-tests budget (repeatable; defaults: "
+             f"{', '.join(f'{name}={value}' for name, value in PERF_BUDGETS.items())})"
+    )
+    
+    parser.add_argument(
+        "--build",
+        action="store_true",
+        help="Run build_runner afterwards, scoped with --build-filter to the outputs of the "
+             "files this run wrote (by default the scoped command is printed)"
+    )
+    
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help=f"Skip the name collision check against the cached project index ({INDEX_FILE_NAME})"
+    )
+    
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Render everything in memory and summarise what would change on disk, without writing"
+    )
+    
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Like --dry-run, and also print a unified diff for every file that would change"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=Path(PROFILE_FILE_NAME),
+        metavar="REPORT",
+        help="Time every generate_* call, file write and step; print totals per layer and write "
+             f"a JSON report (default: {PROFILE_FILE_NAME} in the current directory)"
+    )
+    
+    parser.add_argument(
+        "--cprofile",
+        type=Path,
+        metavar="PSTATS",
+        help="Also run under cProfile and dump its stats here (read with python -m pstats)"
+    )
+    
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate whenever the manifest or a template changes, re-rendering "
+             "only affected features and writing only changed files (uses watchdog if installed)"
+    )
+    
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep a warm generator running and answer line-delimited JSON-RPC 2.0 requests "
+             "(generate, preview, diff, list_features, shutdown) on stdin/stdout"
+    )
+    
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        metavar="PATH",
+        help="With --serve, listen on a Unix domain socket instead of stdin/stdout"
+    )
+    
+    parser.add_argument(
+        "--templates-dir",
+        type=Path,
+        help="Directory of *.dart.tmpl templates overriding the built-in ones"
+    )
+    
     parser.add_argument(
         "--project-root",
         type=Path,
@@ -1546,8 +2562,16 @@ Examples:
     
     args = parser.parse_args()
     
+    if args.serve:
+        if args.feature_name or args.manifest:
+            print("❌ Error: --serve takes feature names in its requests, not on the command line")
+            return 1
+    elif bool(args.feature_name) == bool(args.manifest):
+        print("❌ Error: Provide either a feature name or --manifest, not both")
+        return 1
+    
     # Validate feature name
-    if not re.match(r'^[a-z_]+$', args.feature_name):
+    if args.feature_name and not FEATURE_NAME_PATTERN.match(args.feature_name):
         print("❌ Error: Feature name must be in snake_case (lowercase with underscores)")
         return
     
@@ -1557,18 +2581,119 @@ Examples:
         print("❌ Error: Not in a Flutter project root (pubspec.yaml not found)")
         return
     
+    if args.serve:
+        try:
+            GeneratorService(project_root, args.templates_dir, use_index=not args.no_index).serve(args.socket)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error serving: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    perf_budgets = {}
+    for entry in args.perf_budget:
+        name, _, value = entry.partition("=")
+        if not value.isdigit():
+            print(f"❌ Error: --perf-budget expects NAME=VALUE with a whole number, got '{entry}'")
+            return 1
+        perf_budgets[name] = int(value)
+
+    # --diff is a dry run that also prints the diffs
+    dry_run = args.dry_run or args.diff
+    if args.watch and (dry_run or args.build or args.profile):
+        print("❌ Error: --watch cannot be combined with --dry-run, --diff, --build or --profile")
+        return 1
+    backend = MemoryBackend(read_through=True) if dry_run else None
+    profile = GenerationProfile(project_root) if args.profile else None
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+
     # Generate the feature
     try:
-        generator = FeatureGenerator(args.feature_name, project_root)
-        generator.generate_all_files(
-            skip_presentation=args.skip_presentation,
-            with_tests=args.with_tests
-        )
+        index = None
+        if not args.no_index:
+            index_start = time.perf_counter()
+            index = ProjectIndex.load(project_root, persist=not dry_run)
+            index_time = time.perf_counter() - index_start
+            if profile:
+                profile.phases["index_load"] += index_time * 1000
+            print(index.report(index_time))
+        # Manifest entries override the command-line options
+        defaults = {
+            "skip_presentation": args.skip_presentation,
+            "with_tests": args.with_tests,
+            "with_perf_tests": args.with_perf_tests,
+            "perf_budgets": perf_budgets,
+            "queries": args.query,
+            "fields": args.field,
+            "paginated": args.paginated,
+            "sync_ttl": args.sync_ttl,
+            "binary_payloads": args.binary_payloads,
+            "offload_threshold": args.offload_threshold,
+            "thin": args.thin,
+        }
+        if args.watch:
+            specs = load_manifest(args.manifest) if args.manifest else [{"name": args.feature_name}]
+            FeatureWatcher(
+                [{**defaults, **spec} for spec in specs], project_root,
+                manifest=args.manifest, defaults=defaults, templates_dir=args.templates_dir,
+                force=args.force, index=index
+            ).watch()
+            return 0
+        if args.manifest:
+            specs = [{**defaults, **spec} for spec in load_manifest(args.manifest)]
+            return FeatureGenerator.generate_batch(
+                specs, project_root, jobs=args.jobs,
+                regenerate=args.regenerate, force=args.force,
+                templates_dir=args.templates_dir,
+                run_build=args.build,
+                index=index,
+                backend=backend,
+                dry_run=dry_run,
+                show_diff=args.diff,
+                profile=profile
+            )
+        else:
+            generator = FeatureGenerator(
+                args.feature_name, project_root,
+                lock=GenerationLock(project_root),
+                regenerate=args.regenerate, force=args.force,
+                templates=TemplateRegistry.load(args.templates_dir),
+                queries=args.query,
+                fields=args.field,
+                paginated=args.paginated,
+                sync_ttl=args.sync_ttl,
+                binary_payloads=args.binary_payloads,
+                offload_threshold=args.offload_threshold,
+                thin=args.thin,
+                perf_budgets=perf_budgets,
+                index=index,
+                backend=backend,
+                profile=profile
+            )
+            return generator.generate_all_files(
+                skip_presentation=args.skip_presentation,
+                with_tests=args.with_tests,
+                with_perf_tests=args.with_perf_tests,
+                run_build=args.build,
+                dry_run=dry_run,
+                show_diff=args.diff
+            )
     except Exception as e:
         print(f"❌ Error generating feature: {e}")
         return 1
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+            print(f"📈 cProfile stats written to {args.cprofile}")
+        if profile:
+            report = profile.report()
+            args.profile.write_text(json.dumps(report, indent=2) + "\n", encoding='utf-8')
+            print(f"\n{GenerationProfile.format_summary(report)}")
+            print(f"📈 Profile report written to {args.profile}")
     
     return 0
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())
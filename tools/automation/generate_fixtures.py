@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+TrackFlow Fixture Generator
+Streams synthetic records for generated features into NDJSON/JSON files and
+writes a Dart entry point that bulk-loads them into Isar (and optionally the
+Firestore emulator), so features can be profiled at realistic volumes.
+
+Usage:
+    python generate_fixtures.py <feature_name>... [options]
+
+Example:
+    python generate_fixtures.py notes --count 100000
+    python generate_fixtures.py --manifest features.yaml --count 10000 --owner <uid>
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import random
+import re
+import string
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_feature import (  # noqa: E402
+    DATETIME_STORAGE,
+    DEFAULT_FIELDS,
+    FEATURE_NAME_PATTERN,
+    FIELD_TYPES,
+    FeatureGenerator,
+    FieldSpec,
+    StagedBackend,
+    TemplateRegistry,
+    load_manifest,
+)
+
+FIXTURE_FORMATS = ("ndjson", "json")
+DEFAULT_OUTPUT_DIR = Path("build") / "fixtures"
+FIXTURE_SEEDER_PATH = Path("lib/core/dev/fixture_seeder.dart")
+SEED_ENTRY_PATH = Path("lib/main_seed.dart")
+
+# A few heavy users own most records, like real installs: user k gets weight 1/k^s
+ZIPF_EXPONENT = 1.1
+# Fixed so the same seed always yields the same files
+FIXTURE_EPOCH = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+NULL_RATE = 0.1
+# Record versions: most rows were never edited
+VERSION_WEIGHTS = {1: 70, 2: 15, 3: 8, 4: 4, 5: 3}
+# Firebase Auth UIDs are 28 alphanumeric characters
+USER_ID_ALPHABET = string.ascii_letters + string.digits
+USER_ID_LENGTH = 28
+SHORT_TEXT_PATTERN = re.compile(r'(name|title|label|tag|key|code|status|type)$', re.IGNORECASE)
+WORDS = (
+    "ambient", "bass", "beat", "bridge", "chorus", "demo", "drums", "echo", "final", "groove",
+    "guitar", "harmony", "hook", "intro", "jam", "keys", "live", "loop", "master", "melody",
+    "mix", "outro", "piano", "rough", "session", "synth", "take", "tempo", "track", "verse",
+    "vocal", "acoustic", "remix", "sketch", "stem", "lead", "pad", "riff", "swing", "tape",
+)
+
+
+def make_users(seed: str, count: int, owner: Optional[str] = None) -> List[str]:
+    """Deterministic Firebase-style UIDs, most active first; owner replaces the most active."""
+    rng = random.Random(f"{seed}:users")
+    users = ["".join(rng.choices(USER_ID_ALPHABET, k=USER_ID_LENGTH)) for _ in range(count)]
+    if owner:
+        users[0] = owner
+    return users
+
+
+def iso_timestamp(moment: datetime.datetime) -> str:
+    """The format Dart's DateTime.toUtc().toIso8601String() produces."""
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+def fixture_value(field: FieldSpec, rng: random.Random):
+    """A JSON value for field, shaped like the generated DTO's toJson()."""
+    if field.nullable and rng.random() < NULL_RATE:
+        return None
+    if field.type == "String":
+        if SHORT_TEXT_PATTERN.search(field.name):
+            return " ".join(rng.choices(WORDS, k=rng.randint(1, 4))).title()
+        return " ".join(rng.choices(WORDS, k=rng.randint(4, 24))).capitalize() + "."
+    if field.type == "int":
+        return rng.randint(0, 1000)
+    if field.type == "double":
+        return round(rng.uniform(0, 1000), 2)
+    if field.type == "bool":
+        return rng.random() < 0.5
+    return iso_timestamp(FIXTURE_EPOCH + datetime.timedelta(seconds=rng.uniform(-180, 180) * 86400))
+
+
+def generate_records(generator: FeatureGenerator, count: int, users: List[str], seed: str) -> Iterator[Dict]:
+    """Stream count records for generator's feature; each feature gets its own random stream."""
+    rng = random.Random(f"{seed}:{generator.feature_name}")
+    cum_weights = list(itertools.accumulate(1 / rank ** ZIPF_EXPONENT for rank in range(1, len(users) + 1)))
+    versions, version_weights = zip(*VERSION_WEIGHTS.items())
+    created_at, updated_at = (field.name for field in generator.timestamps)
+    for _ in range(count):
+        created = FIXTURE_EPOCH - datetime.timedelta(seconds=rng.uniform(0, 365) * 86400)
+        # Skewed towards small edits: most rows are touched shortly after creation
+        updated = created + datetime.timedelta(seconds=rng.random() ** 3 * 30 * 86400)
+        record = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "createdBy": rng.choices(users, cum_weights=cum_weights)[0],
+        }
+        for field in generator.fields:
+            record[field.name] = fixture_value(field, rng)
+        record[created_at] = iso_timestamp(created)
+        record[updated_at] = iso_timestamp(updated)
+        record["version"] = rng.choices(versions, weights=version_weights)[0]
+        record["lastModified"] = record[updated_at]
+        yield record
+
+
+def write_records(out: TextIO, records: Iterator[Dict], fixture_format: str) -> int:
+    """Write records one at a time, so memory stays flat at any count. Returns the count."""
+    written = 0
+    if fixture_format == "json":
+        out.write("[")
+    for record in records:
+        line = json.dumps(record, separators=(",", ":"))
+        if fixture_format == "json":
+            out.write(f"{',' if written else ''}\n{line}")
+        else:
+            out.write(f"{line}\n")
+        written += 1
+    if fixture_format == "json":
+        out.write("\n]\n")
+    return written
+
+
+def check_dto_fields(generator: FeatureGenerator) -> Optional[str]:
+    """Why the feature's DTO on disk cannot take these records, or None when it can."""
+    dto_path = generator.feature_root / "data" / "models" / f"{generator.feature_name}_dto.dart"
+    if not dto_path.exists():
+        return f"{dto_path} not found; generate the feature first"
+    source = dto_path.read_text(encoding='utf-8')
+    missing = [
+        field.name for field in generator.fields + generator.timestamps
+        if not re.search(rf'\bfinal {re.escape(field.dart_type)} {field.name};', source)
+    ]
+    if missing:
+        return (f"{dto_path.name} has no field(s) {', '.join(missing)}; pass the --field "
+                "options (or manifest) the feature was generated with")
+    return None
+
+
+def write_seed_entry(generators: List[FeatureGenerator], project_root: Path, templates: TemplateRegistry):
+    """Write the shared seeder once and regenerate lib/main_seed.dart for these features."""
+    backend = StagedBackend(project_root)
+    seeder_path = project_root / FIXTURE_SEEDER_PATH
+    if not backend.exists(seeder_path):
+        backend.write(seeder_path, generators[0].generate_fixture_seeder())
+        print(f"Created: {seeder_path}")
+    entry_path = project_root / SEED_ENTRY_PATH
+    backend.write(entry_path, templates.render("seed_entry", {
+        "seed_imports": "\n".join(sorted(line for generator in generators for line in generator.seed_imports())),
+        "seed_features": ", ".join(generator.feature_name for generator in generators),
+        "seed_steps": "\n".join(generator.generate_seed_step() for generator in generators),
+    }))
+    print(f"Wrote: {entry_path}")
+    backend.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream synthetic fixtures for generated TrackFlow features and a Dart seeding entry point",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python generate_fixtures.py notes --count 100000
+  python generate_fixtures.py tasks --field title:String --field done:bool --format json
+  python generate_fixtures.py --manifest features.yaml --count 10000 --owner <your uid>
+
+Then load them on a device or simulator that can read the output directory:
+  flutter run -t lib/main_seed.dart --dart-define=FIXTURES_DIR=<output dir>
+        """
+    )
+    parser.add_argument(
+        "feature_names",
+        nargs="*",
+        help="Generated features to write fixtures for (snake_case)"
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="Write fixtures for every feature in a generate_feature.py manifest, with its fields"
+    )
+    parser.add_argument(
+        "--field",
+        action="append",
+        default=[],
+        metavar="NAME:TYPE[?][:indexed][:STORAGE]",
+        help="Fields the features were generated with (repeatable; default: "
+             f"{' '.join(DEFAULT_FIELDS)}). TYPE is one of {', '.join(FIELD_TYPES)}; "
+             f"DateTime STORAGE is one of {', '.join(DATETIME_STORAGE)}"
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1000,
+        help="Records per feature (default: 1000)"
+    )
+    parser.add_argument(
+        "--seed",
+        default="0",
+        help="Random seed; the same seed always writes the same records (default: 0)"
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=100,
+        help=f"Distinct createdBy users, Zipf-distributed (s={ZIPF_EXPONENT}) so a few own most "
+             "records (default: 100)"
+    )
+    parser.add_argument(
+        "--owner",
+        metavar="USER_ID",
+        help="Use this UID for the most active user, e.g. your signed-in account"
+    )
+    parser.add_argument(
+        "--format",
+        choices=FIXTURE_FORMATS,
+        default="ndjson",
+        help="One record per line, or a single JSON array (default: ndjson)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        help=f"Where {{feature}}.ndjson files go (default: <project root>/{DEFAULT_OUTPUT_DIR})"
+    )
+    parser.add_argument(
+        "--templates-dir",
+        type=Path,
+        help="Directory of *.dart.tmpl templates overriding the built-in ones"
+    )
+    parser.add_argument(
+        "--project-root",
+        type=Path,
+        help="Path to project root (default: current directory)"
+    )
+    args = parser.parse_args()
+
+    if bool(args.feature_names) == bool(args.manifest):
+        print("❌ Error: Provide either feature names or --manifest, not both")
+        return 1
+    invalid = [name for name in args.feature_names if not FEATURE_NAME_PATTERN.match(name)]
+    if invalid:
+        print(f"❌ Error: Feature names must be in snake_case, got {', '.join(invalid)}")
+        return 1
+    if args.count < 1 or args.users < 1:
+        print("❌ Error: --count and --users must be at least 1")
+        return 1
+
+    project_root = (args.project_root or Path.cwd()).resolve()
+    if not (project_root / "pubspec.yaml").exists():
+        print("❌ Error: Not in a Flutter project root (pubspec.yaml not found)")
+        return 1
+    output_dir = (args.output_dir or project_root / DEFAULT_OUTPUT_DIR).resolve()
+
+    try:
+        specs = load_manifest(args.manifest) if args.manifest else [{"name": name} for name in args.feature_names]
+        templates = TemplateRegistry.load(args.templates_dir)
+        generators = [
+            FeatureGenerator.from_spec({"fields": args.field, **spec}, project_root, templates=templates)
+            for spec in specs
+        ]
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    problems = [problem for problem in map(check_dto_fields, generators) if problem]
+    if problems:
+        for problem in problems:
+            print(f"❌ Error: {problem}")
+        return 1
+
+    users = make_users(args.seed, args.users, args.owner)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"🌱 Writing {args.count:,} records per feature ({args.users} users, seed {args.seed!r})...")
+    for generator in generators:
+        path = output_dir / f"{generator.feature_name}.{args.format}"
+        start = time.perf_counter()
+        with path.open("w", encoding='utf-8') as out:
+            written = write_records(out, generate_records(generator, args.count, users, args.seed), args.format)
+        print(f"  {path}: {written:,} records, {path.stat().st_size / 1_048_576:.1f} MiB "
+              f"in {time.perf_counter() - start:.1f}s")
+
+    print("\n📝 Seed entry point")
+    write_seed_entry(generators, project_root, templates)
+
+    print("\n📝 Next steps:")
+    print(f"1. Run: flutter run -t {SEED_ENTRY_PATH} --dart-define=FIXTURES_DIR={output_dir}")
+    print("2. Add --dart-define=FIRESTORE_EMULATOR_HOST=localhost:8080 to load the Firestore emulator too")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The generator scripts are run in place, not installed
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,100 @@
+import json
+
+from generate_feature import (
+    LOCK_FILE_NAME,
+    FeatureGenerator,
+    GeneratedFile,
+    GenerationLock,
+    MemoryBackend,
+)
+
+
+def write(tmp_path, lock, content, regenerate=True, force=False):
+    """Run content through a generator's write path; returns the outcome counts."""
+    generator = FeatureGenerator(
+        "notes", tmp_path, lock=lock, regenerate=regenerate, force=force,
+        backend=MemoryBackend(read_through=True),
+    )
+    outcomes = generator.write_files([GeneratedFile("data", tmp_path / "notes.dart", content)], headers=False)
+    return outcomes, generator.backend.files
+
+
+def test_hash_is_sha256_of_utf8_content():
+    assert GenerationLock.hash_content("") == (
+        "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+    )
+    assert GenerationLock.hash_content("é") != GenerationLock.hash_content("e")
+
+
+def test_record_is_keyed_relative_to_the_project_root(tmp_path):
+    lock = GenerationLock(tmp_path)
+    lock.record(tmp_path / "lib" / "notes.dart", "content", "notes")
+    lock.save()
+
+    saved = json.loads((tmp_path / LOCK_FILE_NAME).read_text(encoding='utf-8'))
+    entry = saved["files"]["lib/notes.dart"]
+    assert entry["feature"] == "notes"
+    assert entry["sha256"] == GenerationLock.hash_content("content")
+    assert GenerationLock(tmp_path).files == saved["files"]
+
+
+def test_is_modified(tmp_path):
+    lock = GenerationLock(tmp_path)
+    path = tmp_path / "notes.dart"
+    lock.record(path, "generated", "notes")
+
+    assert not lock.is_modified(path, "generated")
+    assert lock.is_modified(path, "edited by hand")
+    assert lock.is_modified(tmp_path / "other.dart", "generated")
+
+
+def test_regenerate_updates_files_it_generated(tmp_path):
+    (tmp_path / "notes.dart").write_text("old", encoding='utf-8')
+    lock = GenerationLock(tmp_path)
+    lock.record(tmp_path / "notes.dart", "old", "notes")
+
+    outcomes, written = write(tmp_path, lock, "new")
+
+    assert outcomes == {"updated": 1}
+    assert written == {tmp_path / "notes.dart": "new"}
+    assert not lock.is_modified(tmp_path / "notes.dart", "new")
+
+
+def test_regenerate_keeps_hand_edited_files(tmp_path):
+    (tmp_path / "notes.dart").write_text("edited", encoding='utf-8')
+    lock = GenerationLock(tmp_path)
+    lock.record(tmp_path / "notes.dart", "old", "notes")
+
+    outcomes, written = write(tmp_path, lock, "new")
+
+    assert outcomes == {"modified": 1}
+    assert written == {}
+
+
+def test_force_overwrites_hand_edited_files(tmp_path):
+    (tmp_path / "notes.dart").write_text("edited", encoding='utf-8')
+    lock = GenerationLock(tmp_path)
+    lock.record(tmp_path / "notes.dart", "old", "notes")
+
+    outcomes, _ = write(tmp_path, lock, "new", force=True)
+
+    assert outcomes == {"updated": 1}
+
+
+def test_unchanged_files_are_not_rewritten(tmp_path):
+    (tmp_path / "notes.dart").write_text("same", encoding='utf-8')
+    lock = GenerationLock(tmp_path)
+
+    outcomes, written = write(tmp_path, lock, "same")
+
+    assert outcomes == {"unchanged": 1}
+    assert written == {}
+    assert not lock.is_modified(tmp_path / "notes.dart", "same")
+
+
+def test_existing_files_are_skipped_without_regenerate(tmp_path):
+    (tmp_path / "notes.dart").write_text("old", encoding='utf-8')
+
+    outcomes, _ = write(tmp_path, GenerationLock(tmp_path), "new", regenerate=False)
+
+    assert outcomes == {"skipped": 1}
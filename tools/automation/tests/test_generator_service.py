@@ -0,0 +1,96 @@
+import pytest
+
+from generate_feature import (
+    RPC_GENERATION_FAILED,
+    RPC_INVALID_PARAMS,
+    RPC_INVALID_REQUEST,
+    RPC_METHOD_NOT_FOUND,
+    RPC_PARSE_ERROR,
+    GeneratorService,
+)
+
+
+@pytest.fixture
+def service(tmp_path):
+    (tmp_path / "pubspec.yaml").write_text("name: trackflow\n", encoding='utf-8')
+    return GeneratorService(tmp_path, use_index=False)
+
+
+def call(service, method, params=None, request_id=1):
+    request = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        request["params"] = params
+    return service.handle(request)
+
+
+def error_code(response):
+    return response["error"]["code"]
+
+
+@pytest.mark.parametrize("request_body", [
+    [],
+    {"id": 1, "method": "preview"},
+    {"jsonrpc": "2.0", "id": 1, "method": 7},
+])
+def test_malformed_requests_are_invalid(service, request_body):
+    assert error_code(service.handle(request_body)) == RPC_INVALID_REQUEST
+
+
+def test_unknown_method(service):
+    assert error_code(call(service, "explode")) == RPC_METHOD_NOT_FOUND
+
+
+@pytest.mark.parametrize("params", [
+    [],
+    {},
+    {"name": "NotSnake"},
+    {"name": "notes", "thin": "yes"},
+    {"name": "notes", "regenerate": 1},
+    {"name": "notes", "sync_ttl": True},
+    {"name": "notes", "sync_ttl": "60"},
+    {"name": "notes", "fields": "title:String"},
+    {"name": "notes", "fields": [3]},
+    {"name": "notes", "queries": [3]},
+    {"name": "notes", "queries": [{"fields": [3]}]},
+    {"name": "notes", "perf_budgets": {"watch_1k_ms": True}},
+    {"name": "notes", "perf_budgets": ["watch_1k_ms"]},
+])
+def test_bad_params_are_invalid(service, params):
+    assert error_code(call(service, "preview", params)) == RPC_INVALID_PARAMS
+
+
+def test_generator_validation_errors_are_generation_failures(service):
+    response = call(service, "preview", {"name": "notes", "fields": ["title:Color"]})
+
+    assert error_code(response) == RPC_GENERATION_FAILED
+
+
+def test_preview_renders_without_writing(service, tmp_path):
+    response = call(service, "preview", {"name": "notes", "fields": ["title:String"], "queries": ["title"]})
+
+    assert response["result"]["feature"] == "notes"
+    assert response["result"]["summary"]["created"] > 0
+    assert not (tmp_path / "lib" / "features" / "notes").exists()
+
+
+def test_notifications_get_no_response(service):
+    assert service.handle({"jsonrpc": "2.0", "method": "list_features"}) is None
+
+
+def test_invalid_json_lines_are_parse_errors(service):
+    responses = []
+    lines = iter(["{not json\n", ""])
+
+    class Reader:
+        def readline(self):
+            return next(lines)
+
+    service.serve_stream(Reader(), responses.append)
+
+    assert len(responses) == 1
+    assert f'"code": {RPC_PARSE_ERROR}' in responses[0]
+
+
+def test_shutdown_stops_the_service(service):
+    assert "result" in call(service, "shutdown")
+    assert not service.running
@@ -0,0 +1,62 @@
+import pytest
+
+from generate_feature import IndexPlanner, QueryShape
+
+FIELD_TYPES = {
+    "id": "String",
+    "createdBy": "String",
+    "isDeleted": "bool",
+    "createdAt": "DateTime",
+    "title": "String",
+}
+
+
+def planner(*queries) -> IndexPlanner:
+    return IndexPlanner([QueryShape.parse(query) for query in queries], FIELD_TYPES)
+
+
+def test_query_shape_accepts_strings_lists_and_named_objects():
+    assert QueryShape.parse("createdBy, isDeleted") == QueryShape(None, ("createdBy", "isDeleted"))
+    assert QueryShape.parse(["title"]) == QueryShape(None, ("title",))
+    assert QueryShape.parse({"name": "byTitle", "fields": "title"}) == QueryShape("byTitle", ("title",))
+
+
+def test_prefix_shapes_share_the_longer_index():
+    plan = planner("createdBy", "createdBy,isDeleted")
+
+    assert plan.indexes == [("createdBy", "isDeleted")]
+    assert plan.annotations("createdBy") == ["@Index(composite: [CompositeIndex('isDeleted')])"]
+    assert plan.annotations("isDeleted") == []
+
+
+def test_single_field_index_annotation():
+    assert planner("title").annotations("title") == ["@Index()"]
+
+
+def test_where_clause_names_the_full_index():
+    clause = planner("createdBy,isDeleted").where_clause(("createdBy", "isDeleted"))
+
+    assert clause == "createdByIsDeletedEqualTo(createdBy, false)"
+
+
+def test_where_clause_on_a_prefix_matches_any_remaining_value():
+    plan = planner("createdBy,isDeleted,createdAt")
+
+    assert plan.where_clause(("createdBy",)) == "createdByEqualToAnyIsDeletedCreatedAt(createdBy)"
+    assert plan.where_clause(("createdBy",), {"createdBy": "userId"}) == (
+        "createdByEqualToAnyIsDeletedCreatedAt(userId)"
+    )
+
+
+def test_parameters_leave_out_is_deleted():
+    assert planner("createdBy,isDeleted").parameters(("createdBy", "isDeleted")) == "String createdBy"
+
+
+@pytest.mark.parametrize("query, message", [
+    ("unknown", "Unknown query field"),
+    ("id", "unique id index"),
+    ("", "at least one field"),
+])
+def test_invalid_shapes_are_rejected(query, message):
+    with pytest.raises(ValueError, match=message):
+        planner(query)
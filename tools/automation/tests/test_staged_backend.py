@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from generate_feature import StagedBackend
+
+
+def staging_dirs(root):
+    return [path for path in root.iterdir() if path.name.startswith(".trackflow_gen_staging_")]
+
+
+def test_commit_writes_new_and_existing_directories(tmp_path):
+    (tmp_path / "lib" / "core").mkdir(parents=True)
+    (tmp_path / "lib" / "core" / "module.dart").write_text("old", encoding='utf-8')
+    backend = StagedBackend(tmp_path)
+    backend.write(tmp_path / "lib" / "core" / "module.dart", "new")
+    backend.write(tmp_path / "lib" / "features" / "notes" / "data" / "notes.dart", "notes")
+    backend.write(tmp_path / "lib" / "features" / "notes" / "domain" / "note.dart", "note")
+
+    backend.commit()
+
+    assert (tmp_path / "lib" / "core" / "module.dart").read_text(encoding='utf-8') == "new"
+    assert (tmp_path / "lib" / "features" / "notes" / "data" / "notes.dart").read_text(encoding='utf-8') == "notes"
+    assert (tmp_path / "lib" / "features" / "notes" / "domain" / "note.dart").read_text(encoding='utf-8') == "note"
+    assert backend.files == {}
+    assert staging_dirs(tmp_path) == []
+
+
+def test_reads_see_staged_writes_before_commit(tmp_path):
+    backend = StagedBackend(tmp_path)
+    path = tmp_path / "lib" / "notes.dart"
+    backend.write(path, "staged")
+
+    assert backend.exists(path)
+    assert backend.read(path) == "staged"
+    assert not path.exists()
+
+
+def test_new_directories_move_into_place_with_one_rename(tmp_path, monkeypatch):
+    (tmp_path / "lib").mkdir()
+    backend = StagedBackend(tmp_path)
+    for name in ("a", "b", "c"):
+        backend.write(tmp_path / "lib" / "features" / "notes" / f"{name}.dart", name)
+    renames = []
+    replace = os.replace
+    monkeypatch.setattr(os, "replace", lambda src, dst: (renames.append(dst), replace(src, dst)))
+
+    backend.commit()
+
+    assert renames == [tmp_path / "lib" / "features"]
+
+
+def test_failed_commit_leaves_the_tree_untouched(tmp_path, monkeypatch):
+    (tmp_path / "lib").mkdir()
+    backend = StagedBackend(tmp_path)
+    backend.write(tmp_path / "lib" / "features" / "notes" / "notes.dart", "notes")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+
+    with pytest.raises(OSError, match="disk full"):
+        backend.commit()
+
+    assert not (tmp_path / "lib" / "features").exists()
+    assert staging_dirs(tmp_path) == []
+    # Nothing was committed, so the writes are still pending
+    assert backend.files
+
+
+def test_empty_commit_does_nothing(tmp_path):
+    StagedBackend(tmp_path).commit()
+
+    assert list(tmp_path.iterdir()) == []